@@ -0,0 +1,41 @@
+"""Decode-time benchmark of recorded Qobuz API responses with every installed JSON backend.
+
+Record a response first, e.g. the raw body of an artist/get (limit=1000) or playlist/get call, then
+run from the OrpheusDL root folder:
+    python modules/qobuz/benchmarks/json_decode.py artist.json playlist.json [--module qobuz] [--runs 20]
+"""
+import argparse
+import importlib
+import os
+import statistics
+import sys
+import time
+
+
+def bench(loads, payload, runs):
+    timings = []
+    for _ in range(runs):
+        t = time.perf_counter()
+        loads(payload)
+        timings.append(time.perf_counter() - t)
+    return timings
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('payloads', nargs='+', help='recorded JSON response bodies')
+    parser.add_argument('--module', default='qobuz', help='folder name of this module inside modules/')
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args()
+
+    sys.path.insert(0, '.')
+    qobuz_api = importlib.import_module(f'modules.{args.module}.qobuz_api')
+    backends = {name: importlib.import_module(qobuz_api.JSON_BACKENDS[name]).loads for name in qobuz_api.installed_json_backends()}
+
+    for path in args.payloads:
+        with open(path, 'rb') as f:
+            payload = f.read()
+        print(f"{os.path.basename(path)} ({len(payload) / 1024 / 1024:.2f} MB)")
+        for name, loads in backends.items():
+            timings = bench(loads, payload, args.runs)
+            print(f"  {name:<8} median {statistics.median(timings) * 1000:8.2f} ms   min {min(timings) * 1000:8.2f} ms")
@@ -0,0 +1,66 @@
+"""Import-time and construction-time benchmark for the Qobuz module.
+
+Run from the OrpheusDL root folder (where orpheus.py lives):
+    python modules/qobuz/benchmarks/startup.py [--module qobuz] [--runs 20]
+
+Import time is measured in a fresh interpreter per run, as OrpheusDL pays it on every start.
+Construction uses offline settings (no token, no credentials) so no network calls are made.
+"""
+import argparse
+import importlib
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+
+def bench_import(module_path, runs):
+    code = f"import time; t = time.perf_counter(); import {module_path}; print(time.perf_counter() - t)"
+    timings = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+        timings.append(float(out.stdout.strip().splitlines()[-1]))
+    return timings
+
+
+def bench_construct(module_path, runs):
+    interface = importlib.import_module(module_path)
+    from utils.models import QualityEnum
+
+    info = interface.module_information
+    settings = {**info.global_settings, **info.session_settings}
+    storage = {}
+    controller = SimpleNamespace(
+        module_settings=settings,
+        data_folder=tempfile.mkdtemp(),
+        extensions={},
+        temporary_settings_controller=SimpleNamespace(read=storage.get, set=storage.__setitem__),
+        module_error=Exception,
+        get_current_timestamp=lambda: int(time.time()),
+        printer_controller=SimpleNamespace(oprint=print),
+        orpheus_options=SimpleNamespace(quality_tier=QualityEnum.HIFI),
+    )
+    timings = []
+    for _ in range(runs):
+        t = time.perf_counter()
+        interface.ModuleInterface(controller)
+        timings.append(time.perf_counter() - t)
+    return timings
+
+
+def _report(name, timings):
+    print(f"{name:<12} median {statistics.median(timings) * 1000:8.2f} ms   min {min(timings) * 1000:8.2f} ms   ({len(timings)} runs)")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--module', default='qobuz', help='folder name of this module inside modules/')
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args()
+
+    sys.path.insert(0, '.')
+    module_path = f'modules.{args.module}.interface'
+    _report('import', bench_import(module_path, args.runs))
+    _report('construct', bench_construct(module_path, args.runs))
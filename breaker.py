@@ -0,0 +1,72 @@
+import time
+import logging
+import threading
+
+
+class CircuitBreaker:
+    """Remembers which (credential, endpoint, tier) combinations are currently failing.
+
+    After a failure the key is "open" for `cooldown` seconds and callers skip it. Once the cooldown
+    has passed, the next allow() starts a single background probe and keeps returning False until
+    the probe succeeds, so no foreground request pays for a tier that is still broken. Each failed
+    probe doubles the cooldown, up to max_cooldown. A probe error that is_failure() doesn't count
+    (e.g. a timeout, which says nothing about the tier) only schedules another probe after the same cooldown.
+    """
+
+    def __init__(self, cooldown: float = 60, max_cooldown: float = 900):
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self._lock = threading.Lock()
+        self._open = {}  # key -> [reopen_at, current_cooldown, probing]
+
+    def allow(self, key, probe=None, is_failure=None) -> bool:
+        """True if key may be tried in the foreground. probe() is run in the background when the cooldown is over;
+        is_failure(exception) decides whether an error it raises counts as a failure (all do by default)."""
+        with self._lock:
+            state = self._open.get(key)
+            if state is None:
+                return True
+            reopen_at, _, probing = state
+            if probing or time.monotonic() < reopen_at:
+                return False
+            if probe is None:
+                # Nothing to probe with: let this caller be the probe
+                return True
+            state[2] = True
+        threading.Thread(target=self._probe, args=(key, probe, is_failure), daemon=True).start()
+        return False
+
+    def is_open(self, key) -> bool:
+        """True while key is failing (cooling down or being probed), without starting a probe."""
+        with self._lock:
+            return key in self._open
+
+    def record_failure(self, key):
+        with self._lock:
+            state = self._open.get(key)
+            cooldown = min(state[1] * 2, self.max_cooldown) if state else self.cooldown
+            self._open[key] = [time.monotonic() + cooldown, cooldown, False]
+        logging.debug(f"Qobuz: {key} failing, skipped for {cooldown:.0f}s")
+
+    def record_success(self, key):
+        with self._lock:
+            if self._open.pop(key, None):
+                logging.debug(f"Qobuz: {key} recovered")
+
+    def _probe(self, key, probe, is_failure):
+        try:
+            probe()
+        except Exception as e:
+            if is_failure is None or is_failure(e):
+                self.record_failure(key)
+            else:
+                self._retry_probe(key, e)
+        else:
+            self.record_success(key)
+
+    def _retry_probe(self, key, error):
+        with self._lock:
+            state = self._open.get(key)
+            if state:
+                state[0], state[2] = time.monotonic() + state[1], False
+        logging.debug(f"Qobuz: probe of {key} inconclusive ({error}), probing again later")
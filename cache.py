@@ -0,0 +1,67 @@
+import json
+import time
+import threading
+from collections import OrderedDict
+
+
+class TTLCache:
+    """Thread-safe in-memory LRU cache whose entries expire ttl seconds after being stored."""
+
+    def __init__(self, maxsize: int = 256, ttl: float = 300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl: float = None):
+        with self._lock:
+            self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class SqliteTTLCache:
+    """Persistent TTLCache counterpart: JSON values in a SQLite file, shared by every run of the module."""
+
+    def __init__(self, path: str, ttl: float = 86400):
+        import os
+        import sqlite3
+
+        self.ttl = ttl
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute('CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)')
+        with self._lock, self._db:
+            self._db.execute('DELETE FROM cache WHERE expires_at < ?', (time.time(),))
+
+    def get(self, key, default=None):
+        with self._lock:
+            row = self._db.execute('SELECT value FROM cache WHERE key = ? AND expires_at >= ?', (str(key), time.time())).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set(self, key, value, ttl: float = None):
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        with self._lock, self._db:
+            self._db.execute('INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)', (str(key), json.dumps(value), expires_at))
+
+    def clear(self):
+        with self._lock, self._db:
+            self._db.execute('DELETE FROM cache')
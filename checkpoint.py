@@ -0,0 +1,98 @@
+import os
+import json
+import time
+import logging
+import threading
+
+
+class JobManifest:
+    """Append-only checkpoint of one playlist/artist/label job, so an interrupted run resumes where it stopped.
+
+    The file is JSON lines: one "expanded" record with the job's item ids and their resolved payloads,
+    then a "started" record when an item is handed to the downloader and a "done" record once it has
+    completely downloaded (or was dropped before downloading). Every record is written with
+    a single append (the file is opened and closed around it, so no handle outlives the write), and a
+    torn last line (crash mid-write) is dropped on load.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.expansion = None
+        self.started = set()
+        self.done = set()
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        try:
+            f = open(self.path, 'rb')
+        except FileNotFoundError:
+            return
+        valid_size = 0
+        with f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                if not line.endswith(b'\n'):
+                    break
+                valid_size += len(line)
+                if 'expanded' in record:
+                    self.expansion = record['expanded']
+                elif 'started' in record:
+                    self.started.add(record['started'])
+                elif 'done' in record:
+                    self.done.add(record['done'])
+        if valid_size != os.path.getsize(self.path):
+            logging.debug(f"Qobuz: dropping torn tail of job manifest {self.path}")
+            with open(self.path, 'r+b') as f:
+                f.truncate(valid_size)
+
+    def _append(self, *records):
+        data = b''.join((json.dumps(record, separators=(',', ':')) + '\n').encode() for record in records)
+        with self._lock:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path, 'ab', buffering=0) as f:
+                f.write(data)
+
+    def expand(self, entity, items, data, sync_state=None):
+        """Record the job's expansion: entity payload, ordered item ids and their payloads. sync_state is
+        kept for the caller to persist once the job has finished."""
+        self.expansion = {'created_at': time.time(), 'entity': entity, 'items': items, 'data': data,
+                          'sync_state': sync_state}
+        self._append({'expanded': self.expansion})
+
+    def age(self) -> float:
+        return time.time() - self.expansion['created_at']
+
+    def remaining(self):
+        """Item ids not finished yet, in job order."""
+        return [i for i in self.expansion['items'] if i not in self.done]
+
+    def finished(self) -> bool:
+        """True once every item is done; an item that was only started (e.g. cut off by a crash) is not."""
+        return all(i in self.done for i in self.expansion['items'])
+
+    def hand_off(self, item_id):
+        """item_id is being downloaded now; it stays unfinished until mark_done()."""
+        if item_id not in self.started:
+            self.started.add(item_id)
+            self._append({'started': item_id})
+
+    def mark_done(self, item_ids):
+        """Items that have completely downloaded, or won't be downloaded in this job (e.g. filtered out)."""
+        new_ids = [i for i in item_ids if i not in self.done]
+        if new_ids:
+            self.done.update(new_ids)
+            self._append(*({'done': i} for i in new_ids))
+
+    def reset(self):
+        with self._lock:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+            self.expansion = None
+            self.started.clear()
+            self.done.clear()
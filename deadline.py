@@ -0,0 +1,38 @@
+import time
+
+
+class Deadline:
+    """Latency budget for one call, passed down through every stage that may block.
+
+    Deadline(None) never expires, so stages can take a deadline unconditionally.
+    """
+
+    def __init__(self, seconds: float = None):
+        self.expires_at = time.monotonic() + seconds if seconds else None
+
+    def remaining(self):
+        """Seconds left (never negative), or None without a budget."""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
+
+    def timeout(self, cap: float) -> float:
+        """Request timeout for the next stage: its own cap, shortened to what's left of the budget."""
+        remaining = self.remaining()
+        return cap if remaining is None else max(0.05, min(cap, remaining))
+
+    def map(self, func, items, max_workers: int):
+        """executor.map that gives up when the deadline passes: unfinished tasks yield None, in input order."""
+        import concurrent.futures
+
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            futures = [executor.submit(func, item) for item in items]
+            concurrent.futures.wait(futures, timeout=self.remaining())
+            return [f.result() if f.done() and not f.exception() else None for f in futures]
+        finally:
+            # Don't wait for stragglers; their own request timeouts are bounded by the deadline too
+            executor.shutdown(wait=self.expires_at is None, cancel_futures=True)
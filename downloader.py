@@ -0,0 +1,166 @@
+import os
+import json
+import logging
+import threading
+
+from utils.utils import create_requests_session
+
+
+class SegmentedDownloader:
+    """Downloads a file over several parallel HTTP Range requests.
+
+    Progress is recorded per segment in a "{dest}.state" file next to the partial download, so
+    an interrupted transfer resumes with only the missing segments. When the CDN rejects the URL
+    (signed stream URLs expire), refresh_url() is called once to obtain a fresh one.
+    """
+
+    # Status codes the CDN answers with once a signed URL has expired
+    EXPIRED_STATUS = {401, 403, 404, 410}
+
+    def __init__(self, connections: int = 4, segment_size: int = 8 * 1024 * 1024, timeout: int = 30, max_retries: int = 5):
+        self.connections = max(1, connections)
+        self.segment_size = segment_size
+        self.timeout = timeout
+        self.max_retries = max_retries
+        # Separate session: the CDN must not receive the Qobuz auth headers
+        self.s = create_requests_session()
+
+    def download(self, url: str, dest_path: str, refresh_url=None) -> str:
+        import concurrent.futures
+
+        self._url = url
+        self._url_generation = 0
+        self._refresh_url = refresh_url
+        self._lock = threading.Lock()
+        # Serialises URL refreshes without holding _lock (and every segment with it) during the request
+        self._refresh_lock = threading.Lock()
+
+        size = self._probe_size()
+        if size is None:
+            # Server doesn't support ranges: plain sequential download
+            self._download_whole(dest_path)
+            return dest_path
+
+        state_path = dest_path + '.state'
+        state = self._load_state(state_path, dest_path, size)
+        if state is None:
+            state = {'size': size, 'segment_size': self.segment_size, 'done': []}
+            with open(dest_path, 'wb') as f:
+                f.truncate(size)
+            self._save_state(state_path, state)
+
+        segment_count = (size + self.segment_size - 1) // self.segment_size
+        done = set(state['done'])
+        pending = [i for i in range(segment_count) if i not in done]
+        if done:
+            logging.debug(f"Qobuz downloader: resuming {dest_path}, {len(pending)}/{segment_count} segments left")
+
+        def _fetch(index):
+            start = index * self.segment_size
+            end = min(start + self.segment_size, size) - 1
+            self._fetch_segment(dest_path, start, end)
+            with self._lock:
+                done.add(index)
+                state['done'] = sorted(done)
+                self._save_state(state_path, state)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.connections) as executor:
+            for future in [executor.submit(_fetch, i) for i in pending]:
+                future.result()
+
+        os.remove(state_path)
+        return dest_path
+
+    def _probe_size(self):
+        """Return the total size if the server honours Range requests, otherwise None."""
+        # Streamed: a server ignoring Range answers 200 with the whole file, which must not be read here
+        r = self._request({'Range': 'bytes=0-0'}, stream=True)
+        try:
+            if r.status_code != 206:
+                return None
+            content_range = r.headers.get('Content-Range', '')
+            total = content_range.rsplit('/', 1)[-1]
+            return int(total) if total.isdigit() else None
+        finally:
+            r.close()
+
+    def _request(self, headers, stream=False):
+        for attempt in range(2):
+            with self._lock:
+                url, generation = self._url, self._url_generation
+            r = self.s.get(url, headers=headers, stream=stream, timeout=self.timeout)
+            if r.status_code not in self.EXPIRED_STATUS or not self._refresh_url or attempt:
+                break
+            r.close()
+            self._renew_url(generation)
+        if r.status_code not in (200, 206):
+            r.close()
+            r.raise_for_status()
+        return r
+
+    def _renew_url(self, generation):
+        with self._refresh_lock:
+            with self._lock:
+                # Another segment already refreshed the URL after this one failed
+                if generation != self._url_generation:
+                    return
+            new_url = self._refresh_url()
+            if not new_url:
+                raise Exception('Could not refresh expired stream URL')
+            with self._lock:
+                self._url = new_url
+                self._url_generation += 1
+            logging.debug('Qobuz downloader: stream URL expired, refreshed')
+
+    def _fetch_segment(self, dest_path, start, end):
+        length = end - start + 1
+        last_error = None
+        for _ in range(self.max_retries):
+            try:
+                r = self._request({'Range': f'bytes={start}-{end}'}, stream=True)
+                with r, open(dest_path, 'r+b') as f:
+                    if r.status_code != 206:
+                        raise Exception(f'Expected partial content, got HTTP {r.status_code}')
+                    content_range = r.headers.get('Content-Range', '')
+                    if not content_range.startswith(f'bytes {start}-'):
+                        raise Exception(f'Expected bytes {start}-{end}, got Content-Range "{content_range}"')
+                    f.seek(start)
+                    written = 0
+                    for chunk in r.iter_content(chunk_size=256 * 1024):
+                        # Never past the segment: extra bytes would overwrite the next one
+                        chunk = chunk[:length - written]
+                        f.write(chunk)
+                        written += len(chunk)
+                        if written == length:
+                            break
+                if written == length:
+                    return
+                last_error = Exception(f'Short read for bytes {start}-{end}: {written}')
+            except Exception as e:
+                last_error = e
+        raise last_error
+
+    def _download_whole(self, dest_path):
+        r = self._request({}, stream=True)
+        with r, open(dest_path, 'wb') as f:
+            for chunk in r.iter_content(chunk_size=256 * 1024):
+                f.write(chunk)
+
+    def _load_state(self, state_path, dest_path, size):
+        try:
+            with open(state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if state.get('size') != size or state.get('segment_size') != self.segment_size:
+            return None
+        if not os.path.isfile(dest_path) or os.path.getsize(dest_path) != size:
+            return None
+        return state
+
+    @staticmethod
+    def _save_state(state_path, state):
+        tmp_path = state_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, state_path)
@@ -0,0 +1,187 @@
+import os
+import json
+
+
+# (field, type) of the exported records; types map to the Parquet schema, 'json' columns are JSON strings there
+ALBUM_FIELDS = (
+    ('id', 'string'), ('upc', 'string'), ('title', 'string'), ('version', 'string'),
+    ('artist_id', 'string'), ('artist', 'string'), ('label_id', 'string'), ('label', 'string'),
+    ('genre', 'string'), ('release_type', 'string'), ('release_date', 'string'),
+    ('tracks_count', 'int'), ('duration', 'int'), ('maximum_bit_depth', 'int'),
+    ('maximum_sampling_rate', 'float'), ('hires', 'bool'), ('hires_streamable', 'bool'),
+    ('streamable', 'bool'), ('explicit', 'bool'),
+)
+TRACK_FIELDS = (
+    ('id', 'string'), ('isrc', 'string'), ('title', 'string'), ('version', 'string'),
+    ('album_id', 'string'), ('artist_id', 'string'), ('artist', 'string'),
+    ('media_number', 'int'), ('track_number', 'int'), ('duration', 'int'),
+    ('maximum_bit_depth', 'int'), ('maximum_sampling_rate', 'float'), ('hires', 'bool'),
+    ('hires_streamable', 'bool'), ('streamable', 'bool'), ('explicit', 'bool'), ('credits', 'json'),
+)
+
+
+def _str_id(value):
+    return str(value) if value not in (None, '') else None
+
+
+def album_record(album):
+    """Normalised export record of an album/get (or listing) payload."""
+    artist = album.get('artist') or {}
+    label = album.get('label') or {}
+    genre = album.get('genre') or {}
+    return {
+        'id': _str_id(album.get('id')),
+        'upc': album.get('upc'),
+        'title': album.get('title'),
+        'version': album.get('version'),
+        'artist_id': _str_id(artist.get('id')),
+        'artist': artist.get('name'),
+        'label_id': _str_id(label.get('id')),
+        'label': label.get('name'),
+        'genre': genre.get('name'),
+        'release_type': album.get('release_type') or album.get('product_type'),
+        'release_date': album.get('release_date_original'),
+        'tracks_count': album.get('tracks_count'),
+        'duration': album.get('duration'),
+        'maximum_bit_depth': album.get('maximum_bit_depth'),
+        'maximum_sampling_rate': album.get('maximum_sampling_rate'),
+        'hires': album.get('hires'),
+        'hires_streamable': album.get('hires_streamable'),
+        'streamable': album.get('streamable'),
+        'explicit': album.get('parental_warning'),
+    }
+
+
+def track_record(track, album_id, credits):
+    """Normalised export record of a track payload; credits is a {role: [names]} dict."""
+    performer = track.get('performer') or {}
+    return {
+        'id': _str_id(track.get('id')),
+        'isrc': track.get('isrc'),
+        'title': track.get('title'),
+        'version': track.get('version'),
+        'album_id': _str_id(album_id),
+        'artist_id': _str_id(performer.get('id')),
+        'artist': performer.get('name'),
+        'media_number': track.get('media_number'),
+        'track_number': track.get('track_number'),
+        'duration': track.get('duration'),
+        'maximum_bit_depth': track.get('maximum_bit_depth'),
+        'maximum_sampling_rate': track.get('maximum_sampling_rate'),
+        'hires': track.get('hires'),
+        'hires_streamable': track.get('hires_streamable'),
+        'streamable': track.get('streamable'),
+        'explicit': track.get('parental_warning'),
+        'credits': credits,
+    }
+
+
+class _JsonlSink:
+    def __init__(self, path, fields):
+        self._file = open(path, 'w', encoding='utf-8')
+
+    def write(self, record):
+        self._file.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n')
+
+    def close(self):
+        self._file.close()
+
+
+class _ParquetSink:
+    """Buffers batch_size rows and writes each batch as a Parquet row group."""
+
+    def __init__(self, path, fields, batch_size=5000):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        types = {'string': pa.string(), 'int': pa.int64(), 'float': pa.float64(), 'bool': pa.bool_(), 'json': pa.string()}
+        self._pa = pa
+        self._json_fields = [name for name, kind in fields if kind == 'json']
+        self._schema = pa.schema([(name, types[kind]) for name, kind in fields])
+        self._writer = pq.ParquetWriter(path, self._schema)
+        self._batch_size = batch_size
+        self._rows = []
+
+    def write(self, record):
+        for name in self._json_fields:
+            record[name] = json.dumps(record[name], ensure_ascii=False) if record[name] is not None else None
+        self._rows.append(record)
+        if len(self._rows) >= self._batch_size:
+            self._flush()
+
+    def _flush(self):
+        if self._rows:
+            self._writer.write_table(self._pa.Table.from_pylist(self._rows, schema=self._schema))
+            self._rows = []
+
+    def close(self):
+        self._flush()
+        self._writer.close()
+
+
+class MetadataExporter:
+    """Streams album and track records to albums.<ext> and tracks.<ext> in output_dir.
+
+    Records are written (or, for Parquet, buffered per row group) as they arrive, so memory stays
+    bounded by the batch size plus the ids already exported, which deduplicate across entities.
+    Album stubs (the album payload nested in a playlist track) are only written at close(), for
+    albums that never got a full album/get record. fmt is 'jsonl' or 'parquet' (needs pyarrow).
+    """
+
+    FORMATS = {'jsonl': _JsonlSink, 'parquet': _ParquetSink}
+
+    def __init__(self, output_dir: str, fmt: str = 'jsonl'):
+        if fmt not in self.FORMATS:
+            raise ValueError(f'unknown export format "{fmt}", expected one of: {", ".join(self.FORMATS)}')
+        if fmt == 'parquet':
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                raise ValueError('the parquet format needs pyarrow (pip install pyarrow)')
+        os.makedirs(output_dir, exist_ok=True)
+        sink = self.FORMATS[fmt]
+        self._albums = sink(os.path.join(output_dir, f'albums.{fmt}'), ALBUM_FIELDS)
+        self._tracks = sink(os.path.join(output_dir, f'tracks.{fmt}'), TRACK_FIELDS)
+        self._expanded_album_ids = set()  # albums exported from album/get, with their full track list
+        self._album_stubs = {}
+        self._track_ids = set()
+
+    @property
+    def counts(self):
+        return {'albums': len(self._expanded_album_ids) + len(self._album_stubs), 'tracks': len(self._track_ids)}
+
+    def album_expanded(self, album_id) -> bool:
+        return str(album_id) in self._expanded_album_ids
+
+    def add_album(self, album):
+        """Full album/get payload: written now, replacing any stub seen for the same album."""
+        record = album_record(album)
+        if record['id'] and record['id'] not in self._expanded_album_ids:
+            self._expanded_album_ids.add(record['id'])
+            self._album_stubs.pop(record['id'], None)
+            self._albums.write(record)
+
+    def add_album_stub(self, album):
+        """Partial album payload (from a playlist track): kept until close() unless the full album shows up."""
+        record = album_record(album)
+        if record['id'] and record['id'] not in self._expanded_album_ids:
+            self._album_stubs.setdefault(record['id'], record)
+
+    def add_track(self, track, album_id, credits):
+        record = track_record(track, album_id, credits)
+        if record['id'] and record['id'] not in self._track_ids:
+            self._track_ids.add(record['id'])
+            self._tracks.write(record)
+
+    def close(self):
+        for record in self._album_stubs.values():
+            self._albums.write(record)
+        self._album_stubs.clear()
+        self._albums.close()
+        self._tracks.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
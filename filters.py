@@ -0,0 +1,99 @@
+import re
+import operator
+from datetime import datetime
+
+
+# Rule fields and how to read them from a Qobuz track/album payload.
+# Track payloads fall back to their album (passed as parent) for album-level fields.
+def _year(payload):
+    date_val = payload.get('release_date_original') or payload.get('released_at')
+    if isinstance(date_val, (int, float)):
+        try:
+            return int(datetime.utcfromtimestamp(date_val).strftime('%Y'))
+        except (OSError, ValueError):
+            return None
+    try:
+        return int(str(date_val).split('-')[0]) if date_val else None
+    except ValueError:
+        return None
+
+
+def _artist(payload, key):
+    artist = payload.get('performer') or payload.get('artist')
+    return artist.get(key) if isinstance(artist, dict) else None
+
+
+FIELDS = {
+    'streamable': lambda p: p.get('streamable'),
+    'hires': lambda p: p.get('hires_streamable', p.get('hires')),
+    'explicit': lambda p: p.get('parental_warning'),
+    'bit_depth': lambda p: p.get('maximum_bit_depth'),
+    'sample_rate': lambda p: p.get('maximum_sampling_rate'),
+    'year': _year,
+    'duration': lambda p: p.get('duration'),
+    'artist_id': lambda p: _artist(p, 'id'),
+    'artist': lambda p: _artist(p, 'name'),
+    'release_type': lambda p: p.get('release_type') or p.get('product_type'),
+    'genre': lambda p: (p.get('genre') or {}).get('name') if isinstance(p.get('genre'), dict) else None,
+}
+
+OPERATORS = {
+    '>=': operator.ge,
+    '<=': operator.le,
+    '!=': operator.ne,
+    '>': operator.gt,
+    '<': operator.lt,
+    '=': operator.eq,
+}
+
+_RULE_REGEX = re.compile(r'^(?P<neg>!?)(?P<field>\w+)\s*(?:(?P<op>>=|<=|!=|>|<|=)\s*(?P<value>.+))?$')
+
+
+class PayloadFilter:
+    """Declarative keep-rules evaluated on raw Qobuz payloads before any per-item API work.
+
+    Rules are separated by commas or semicolons and must all match for a payload to be kept:
+        streamable, hires, !explicit, bit_depth>=24, year>=2010, year<=2020, release_type!=compilation
+    A bare field tests truthiness, "!field" its negation. Fields missing from the payload never
+    reject it, since listing payloads don't always carry every field.
+    """
+
+    def __init__(self, rules: str = ''):
+        self.rules = [self._parse(r.strip()) for r in re.split(r'[,;]', rules or '') if r.strip()]
+
+    def __bool__(self):
+        return bool(self.rules)
+
+    @staticmethod
+    def _parse(rule):
+        match = _RULE_REGEX.match(rule)
+        if not match or match.group('field') not in FIELDS:
+            raise ValueError(f'Invalid filter rule "{rule}", fields are: {", ".join(FIELDS)}')
+        if match.group('op') and match.group('neg'):
+            raise ValueError(f'Invalid filter rule "{rule}": "!" only applies to bare fields')
+        return match.group('field'), match.group('neg'), match.group('op'), match.group('value')
+
+    def matches(self, payload: dict, parent: dict = None) -> bool:
+        for field, negate, op, value in self.rules:
+            actual = FIELDS[field](payload)
+            if actual is None and parent:
+                actual = FIELDS[field](parent)
+            if actual is None:
+                continue
+            if not op:
+                if bool(actual) == bool(negate):
+                    return False
+                continue
+            expected = value.strip()
+            if isinstance(actual, bool):
+                expected = expected.lower() in ('true', '1', 'yes')
+            elif isinstance(actual, (int, float)):
+                try:
+                    expected = float(expected)
+                except ValueError:
+                    return False
+            else:
+                actual, expected = str(actual).lower(), expected.lower()
+            if not OPERATORS[op](actual, expected):
+                return False
+        return True
@@ -0,0 +1,97 @@
+import time
+import logging
+import threading
+from collections import deque, defaultdict
+
+
+class Hedger:
+    """Hedged requests: when an idempotent call hasn't answered by its endpoint's recent p95 latency,
+    a duplicate is sent and whichever answers first wins.
+
+    Extra load is capped by a token budget: every request earns `budget` of a hedge (0.05 allows
+    about 5% extra requests) and each hedge spends one. Per-endpoint request, hedge and win counts
+    are available from metrics().
+    """
+
+    def __init__(self, percentile: float = 0.95, budget: float = 0.05, window: int = 200, min_samples: int = 20,
+                 min_delay: float = 0.05, max_workers: int = 32):
+        self.percentile = percentile
+        self.budget = budget
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.max_workers = max_workers
+        self._latencies = defaultdict(lambda: deque(maxlen=window))
+        self._counts = defaultdict(lambda: {'requests': 0, 'hedged': 0, 'hedge_wins': 0})
+        self._tokens = 0.0
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def threshold(self, endpoint):
+        """Current hedge delay for endpoint, or None until enough latencies were seen."""
+        with self._lock:
+            samples = sorted(self._latencies[endpoint])
+        if len(samples) < self.min_samples:
+            return None
+        return max(self.min_delay, samples[min(len(samples) - 1, int(len(samples) * self.percentile))])
+
+    def metrics(self):
+        with self._lock:
+            counts = {endpoint: dict(c) for endpoint, c in self._counts.items()}
+        for endpoint, c in counts.items():
+            c['hedge_rate'] = c['hedged'] / c['requests'] if c['requests'] else 0.0
+            c['threshold'] = self.threshold(endpoint)
+        return counts
+
+    def _record(self, endpoint, started):
+        with self._lock:
+            self._latencies[endpoint].append(time.monotonic() - started)
+
+    def _take_hedge(self, endpoint):
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            self._counts[endpoint]['hedged'] += 1
+            return True
+
+    def _timed(self, endpoint, send):
+        started = time.monotonic()
+        result = send()
+        self._record(endpoint, started)
+        return result
+
+    def run(self, endpoint, send):
+        """send() the request, hedging it with a second send() if it is slower than the threshold."""
+        import concurrent.futures
+
+        with self._lock:
+            self._counts[endpoint]['requests'] += 1
+            self._tokens = min(self._tokens + self.budget, 10.0)
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='qobuz-hedge')
+        delay = self.threshold(endpoint)
+        if delay is None:
+            return self._timed(endpoint, send)
+
+        primary = self._executor.submit(self._timed, endpoint, send)
+        try:
+            return primary.result(timeout=delay)
+        except concurrent.futures.TimeoutError:
+            pass
+        if not self._take_hedge(endpoint):
+            return primary.result()
+
+        hedge = self._executor.submit(self._timed, endpoint, send)
+        logging.debug(f"Qobuz: hedging {endpoint} after {delay * 1000:.0f}ms")
+        pending = {primary, hedge}
+        error = None
+        while pending:
+            done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        with self._lock:
+                            self._counts[endpoint]['hedge_wins'] += 1
+                    return future.result()
+                error = error or future.exception()
+        raise error
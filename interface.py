@@ -1,24 +1,56 @@
 import os
+import hashlib
+import tempfile
 import unicodedata
 import re
 import logging
-import socket
-import threading
-import webbrowser
 from datetime import datetime
-from http.server import HTTPServer, BaseHTTPRequestHandler
 from urllib.parse import parse_qs, urlparse
-import concurrent.futures
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
 
 from utils.models import *
-from .qobuz_api import Qobuz
+from utils.utils import create_requests_session
+from .qobuz_api import Qobuz, get_json_decoder
+from .filters import PayloadFilter
+from .storage import JsonStore
+from .cache import TTLCache, SqliteTTLCache
+from .breaker import CircuitBreaker
+from .deadline import Deadline
+from .checkpoint import JobManifest
+from .scheduler import Priority, PriorityGate
 
 
 module_information = ModuleInformation(
     service_name = 'Qobuz',
     module_supported_modes = ModuleModes.download | ModuleModes.credits,
     login_behaviour = ManualEnum.manual,
-    global_settings = {'app_id': '798273057', 'app_secret': 'abb21364945c0583309667d13ca3d93a', 'quality_format': '{sample_rate}kHz/{bit_depth}bit'},
+    global_settings = {
+        'app_id': '798273057',
+        'app_secret': 'abb21364945c0583309667d13ca3d93a',
+        'quality_format': '{sample_rate}kHz/{bit_depth}bit',
+        'profile_dir': '',
+        'download_connections': 1,
+        'prefetch_tracks': 0,
+        'defer_file_url': False,
+        'track_filter': '',
+        'incremental_sync': False,
+        'search_cache_ttl': 300,
+        'search_deadline': 0,
+        'token_check_interval': 600,
+        'json_backend': 'auto',
+        'library_index': '',
+        'worker_processes': 0,
+        'worker_rate_limit': 10,
+        'checkpoint_jobs': False,
+        'album_filter': '',
+        'max_concurrent_requests': 0,
+        'hedge_requests': False,
+        'preview_cache_ttl': 604800,
+        'search_mode': 'online',
+        'search_index_max_age': 604800,
+    },
     session_settings = {'username': '', 'password': '', 'user_id': '', 'auth_token': '', 'use_id_token': 'false'},
     session_storage_variables = ['token', 'user_id'],
     netlocation_constant = 'qobuz',
@@ -34,11 +66,98 @@ module_information = ModuleInformation(
 )
 
 
+# Normalize credit roles to standard tagging keys
+ROLE_MAPPING = {
+    'Lyricist': 'Lyricist',
+    'Lyricists': 'Lyricist',
+    'Vocals': 'Lyricist',
+    'Composer': 'Composer',
+    'Composers': 'Composer',
+    'Producer': 'Producer',
+    'Producers': 'Producer'
+}
+
+
+def _parse_credits(track_contributors):
+    """{role: [names]} from a track's 'performers' string."""
+    # Credits look like: {name}, {type1}, {type2} - {name2}, {type2}
+    credits_dict = {}
+    if track_contributors:
+        for credit in track_contributors.split(' - '):
+            contributor_role = [ROLE_MAPPING.get(r, r) for r in credit.split(', ')[1:]]
+            contributor_name = credit.split(', ')[0]
+
+            for role in contributor_role:
+                # Check if the dict contains no list, create one
+                if role not in credits_dict:
+                    credits_dict[role] = []
+                # Now add the name to the type list
+                if contributor_name not in credits_dict[role]:
+                    credits_dict[role].append(contributor_name)
+    return credits_dict
+
+
+@lru_cache(maxsize=4096)
+def _ascii_name(name):
+    return unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode('utf-8')
+
+
+@dataclass(frozen=True)
+class AlbumContext:
+    """Album-level TrackInfo/Tags fields, computed once per album and shared by all of its tracks."""
+    album_id: str
+    album_name: str
+    album_artist: str
+    cover_url: str
+    release_date: str
+    release_year: int
+    total_tracks: int
+    total_discs: int
+    upc: str
+    label: str
+    copyright: str
+    genres: tuple
+
+
 class ModuleInterface:
+    # Entry points wrapped by the profiler when 'profile_dir' is set
+    PROFILED_ENTRY_POINTS = (
+        'get_track_info', 'get_track_download', 'get_album_info', 'get_playlist_info',
+        'get_artist_info', 'get_label_info', 'get_track_credits', 'search',
+    )
+    PLAYLIST_PAGE_SIZE = 500  # Qobuz API limit per request
+    # Only the extras this module reads: the playlists/appears-on/subscribers subtrees are the bulk of
+    # large artist/playlist responses and would be downloaded and decoded for nothing
+    ARTIST_EXTRAS = 'albums,albums_with_last_release,focusAll'
+    PLAYLIST_EXTRAS = 'tracks,focusAll'
+    # Album payload fields AlbumContext is built from; a context is rebuilt from a payload with more of them
+    ALBUM_CONTEXT_KEYS = ('title', 'image', 'artist', 'release_date_original', 'tracks_count', 'media_count',
+                          'upc', 'label', 'copyright', 'genre')
+    # Below this many albums to backfill, starting worker processes costs more than it saves
+    SHARDED_BACKFILL_MIN = 50
+    # Interrupted jobs older than this are expanded afresh instead of resumed
+    CHECKPOINT_MAX_AGE = 7 * 86400
+    # Tracks iTunes had no preview for are looked up again after a day, found previews live for preview_cache_ttl
+    PREVIEW_MISS_TTL = 86400
+    # 'local_first' answers from the offline index and searches online on a miss, 'local' never goes online
+    SEARCH_MODES = ('online', 'local_first', 'local')
+
     def __init__(self, module_controller: ModuleController):
         settings = module_controller.module_settings
         self.session = Qobuz(settings['app_id'], settings['app_secret'], module_controller.module_error)
         self.module_controller = module_controller
+        try:
+            self.session.json_loads = get_json_decoder(settings.get('json_backend') or 'auto')
+        except ValueError as e:
+            raise module_controller.module_error(f'json_backend: {e}')
+        # Interactive calls (search) jump ahead of queued bulk requests once concurrency is capped
+        max_concurrent_requests = int(settings.get('max_concurrent_requests') or 0)
+        if max_concurrent_requests > 0:
+            self.session.gate = PriorityGate(max_concurrent_requests)
+        # Slow GETs (getFileUrl, search, ...) get a duplicate request once they exceed their endpoint's p95
+        if str(settings.get('hedge_requests')).lower() == 'true':
+            from .hedge import Hedger
+            self.session.hedger = Hedger()
         
         # Load credentials from both persistent settings and session storage
         storage = module_controller.temporary_settings_controller
@@ -50,21 +169,15 @@ class ModuleInterface:
         if not settings.get('user_id') and user_id:
             settings['user_id'] = user_id
 
-        # Trust the saved token at startup - we will re-validate only if an API call fails
-        if self.session.auth_token:
-            pass
-        else:
-            # No token, try fallback to email/pass if present
-            username = (settings.get('username') or '').strip()
-            password = (settings.get('password') or '').strip()
-            if username and password:
-                try:
-                    self.login(username, password)
-                except:
-                    pass
-
-
+        # Trust the saved token at startup - we will re-validate only if an API call fails.
+        # Without one, email/pass login is deferred to first use (_ensure_credentials / is_authenticated)
+        # so loading the module never blocks on the network.
+        self._login_pending = not self.session.auth_token and bool(
+            (settings.get('username') or '').strip() and (settings.get('password') or '').strip())
 
+        # Token validity is re-checked in the background once the cached result is this old (0 = never)
+        self.session.token_ttl = int(settings.get('token_check_interval') or 0)
+        self._token_check_running = False
 
         # 5 = 320 kbps MP3, 6 = 16-bit FLAC, 7 = 24-bit / =< 96kHz FLAC, 27 =< 192 kHz FLAC
         self.quality_parse = {
@@ -78,14 +191,263 @@ class ModuleInterface:
         }
         self.quality_tier = module_controller.orpheus_options.quality_tier
         self.quality_format = settings.get('quality_format')
+        self.defer_file_url = str(settings.get('defer_file_url')).lower() == 'true'
+        self.incremental_sync = str(settings.get('incremental_sync')).lower() == 'true'
+        self._album_contexts = OrderedDict()
+
+        # Playlist/artist/label jobs are checkpointed to disk and resumed after an interruption
+        self.checkpoint_jobs = str(settings.get('checkpoint_jobs')).lower() == 'true'
+        self._job_items = {}  # (kind, item id) -> JobManifest of the job it belongs to
+        # Albums of artist/label jobs: album id -> (JobManifest, ids of its tracks not downloaded yet), and track -> album
+        self._job_albums = {}
+        self._job_album_tracks = {}
+
+        # (formatted search results, credential tier that answered) per normalised query/type/limit/login state
+        search_cache_ttl = int(settings.get('search_cache_ttl') or 0)
+        self.search_cache = TTLCache(maxsize=256, ttl=search_cache_ttl) if search_cache_ttl > 0 else None
+        self.search_deadline = float(settings.get('search_deadline') or 0) or None
+        self._scraper_session = None
+        self._scraper_cache = TTLCache(maxsize=64, ttl=300)
+        # iTunes preview fallback answers (URL, or '' for none) per Qobuz track id, kept across runs.
+        # Opened on the first lookup so startup doesn't touch the data folder.
+        self._itunes_session = None
+        self.preview_cache_ttl = int(settings.get('preview_cache_ttl') or 0)
+        self.preview_cache = None
+
+        # Offline search index fed by every payload seen, answering searches before catalog/search
+        self.search_mode = (settings.get('search_mode') or 'online').strip().lower()
+        if self.search_mode not in self.SEARCH_MODES:
+            raise module_controller.module_error(f'search_mode: expected one of {", ".join(self.SEARCH_MODES)}')
+        self.search_index_max_age = float(settings.get('search_index_max_age') or 0) or None
+        self.search_index = None
+        if self.search_mode != 'online':
+            from .search_index import SearchIndex
+            try:
+                self.search_index = SearchIndex(self._data_path('search_index.db'))
+            except ValueError as e:
+                raise module_controller.module_error(f'search_mode: {e}')
+
+        # Credential tiers (auth/guest) that keep failing are skipped for a cooldown and probed in the background
+        self.search_breaker = CircuitBreaker(cooldown=60)
+
+        # Rules applied to album/playlist tracks at expansion time, before any per-track API work
+        try:
+            self.track_filter = PayloadFilter(settings.get('track_filter') or '')
+        except ValueError as e:
+            raise module_controller.module_error(f'track_filter: {e}')
+        # Same rules for artist/label albums, checked on the listing payload before any album/get backfill
+        try:
+            self.album_filter = PayloadFilter(settings.get('album_filter') or '')
+        except ValueError as e:
+            raise module_controller.module_error(f'album_filter: {e}')
+
+        # Already archived tracks (by Qobuz id / ISRC and quality) are skipped at expansion time
+        self.library_index = None
+        self._archive_candidates = OrderedDict()
+        library_index_path = (settings.get('library_index') or '').strip()
+        if library_index_path:
+            from .library_index import LibraryIndex
+            self.library_index = LibraryIndex(library_index_path)
+
+        # Album metadata backfill of large label/artist catalogues is sharded over worker processes
+        self.worker_processes = int(settings.get('worker_processes') or 0)
+        self.worker_rate_limit = float(settings.get('worker_rate_limit') or 0)
+
+        # Look-ahead resolution of stream URLs while an album/playlist downloads
+        self.prefetcher = None
+        lookahead = int(settings.get('prefetch_tracks') or 0)
+        if lookahead > 0:
+            from .prefetch import StreamPrefetcher
+            resolve = lambda track_id, quality_id: self.session.get_file_url(track_id, quality_id, priority=Priority.BACKGROUND)
+            self.prefetcher = StreamPrefetcher(resolve, lookahead=lookahead, max_workers=2)
+
+        # Opt-in profiling: wrap every entry point so each call writes a .prof and a .folded stack dump
+        self.profiler = None
+        profile_dir = (settings.get('profile_dir') or '').strip()
+        if profile_dir:
+            from .profiling import Profiler
+            self.profiler = Profiler(profile_dir)
+            for name in self.PROFILED_ENTRY_POINTS:
+                setattr(self, name, self.profiler.wrap(name, getattr(self, name)))
+
+    def _task(self, name, func):
+        """Wrap an executor task so it is profiled as its own job when profiling is enabled."""
+        return self.profiler.wrap(name, func) if self.profiler else func
+
+    def _data_path(self, *parts):
+        """Path inside the module's data folder (system temp folder if the core doesn't provide one)."""
+        return os.path.join(getattr(self.module_controller, 'data_folder', None) or os.path.join(tempfile.gettempdir(), 'qobuz'), *parts)
+
+    def _sync_albums(self, kind, entity_id, first_page, fetch_page):
+        """Incremental sync: return only albums not returned by a previous run for this label/artist.
+
+        A per-entity watermark (newest release date), the returned album ids and the seen ones (returned
+        or rejected by album_filter) are persisted. Pages are fetched until one is entirely made of seen
+        albums no newer than the watermark. Listed albums that weren't returned before are checked
+        against album_filter again, and a changed filter makes every page count as unseen once, so
+        relaxing it brings the rejected albums back.
+        Returns (new albums passing album_filter, sync state); the caller saves it with _save_sync."""
+        store = JsonStore(self._data_path('sync'))
+        key = f'{kind}_{entity_id}'
+        state = store.load(key)
+        returned = set(state['album_ids']) if state else set()
+        rules = [list(rule) for rule in self.album_filter.rules]
+        seen = set(state.get('seen_ids') or []) if state and state.get('album_filter') == rules else set()
+        seen |= returned
+        watermark = state['watermark'] if state else ''
+
+        candidates, candidate_ids, dates, page, offset = [], set(), [watermark], first_page, 0
+        while True:
+            items = [a for a in (page.get('items') or []) if isinstance(a, dict)]
+            page_known = True
+            for album in items:
+                album_id = str(album.get('id'))
+                release_date = str(album.get('release_date_original') or '')
+                if album_id not in returned and album_id not in candidate_ids:
+                    candidate_ids.add(album_id)
+                    candidates.append(album)
+                if album_id not in seen:
+                    seen.add(album_id)
+                    page_known = False
+                elif release_date > watermark:
+                    page_known = False
+                dates.append(release_date)
+            offset += len(page.get('items') or [])
+            if not items or offset >= (page.get('total') or 0) or (state and page_known):
+                break
+            page = fetch_page(offset) or {}
+
+        new_albums = self._filter_albums(candidates)
+        returned |= {str(a.get('id')) for a in new_albums}
+        logging.debug(f"Qobuz: incremental sync of {key} found {len(new_albums)} new albums")
+        return new_albums, (key, {'watermark': max(dates), 'album_ids': sorted(returned),
+                                  'seen_ids': sorted(seen), 'album_filter': rules})
+
+    def _save_sync(self, key, state):
+        JsonStore(self._data_path('sync')).save(key, state)
+
+    def _commit_sync(self, manifest, sync_state):
+        """Persist an incremental sync state now, or, for a checkpointed job, once the job has finished,
+        so an interrupted job's new albums/tracks aren't lost."""
+        if sync_state and not manifest:
+            self._save_sync(*sync_state)
+
+    def _job_manifest(self, kind, entity_id):
+        """Checkpoint of this playlist/artist/label job (None when disabled). Finished or stale ones start over."""
+        if not self.checkpoint_jobs:
+            return None
+        safe_id = ''.join(c if c.isalnum() or c in '-_' else '_' for c in str(entity_id))
+        manifest = JobManifest(self._data_path('jobs', f'{kind}_{safe_id}.jsonl'))
+        # A previous run of this job in the same session is superseded: stop routing hand-offs to it
+        self._job_items = {k: m for k, m in self._job_items.items() if m.path != manifest.path}
+        self._job_albums = {a: job for a, job in self._job_albums.items() if job[0].path != manifest.path}
+        self._job_album_tracks = {t: a for t, a in self._job_album_tracks.items() if a in self._job_albums}
+        if manifest.expansion and (manifest.finished() or manifest.age() > self.CHECKPOINT_MAX_AGE):
+            if manifest.finished() and manifest.expansion.get('sync_state'):
+                self._save_sync(*manifest.expansion['sync_state'])
+            manifest.reset()
+        elif manifest.expansion:
+            logging.debug(f"Qobuz: resuming {kind} {entity_id}, {len(manifest.remaining())} of {len(manifest.expansion['items'])} items left")
+        return manifest
+
+    def _track_job(self, kind, manifest, item_ids, kept_ids):
+        """Route hand-offs and finished downloads of the job's kept items to its manifest; dropped items are done already."""
+        kept = set(kept_ids)
+        manifest.mark_done([i for i in item_ids if i not in kept])
+        for item_id in kept_ids:
+            self._job_items[(kind, item_id)] = manifest
+
+    def _hand_off(self, kind, item_id):
+        manifest = self._job_items.get((kind, str(item_id)))
+        if manifest:
+            manifest.hand_off(str(item_id))
+
+    def _track_album_job(self, album_id, track_ids):
+        """An album of an artist/label job was expanded: it is done once all of its (kept) tracks have downloaded."""
+        manifest = self._job_items.get(('album', album_id))
+        if not manifest:
+            return
+        if not track_ids:
+            manifest.mark_done([album_id])
+            return
+        self._job_albums[album_id] = (manifest, set(track_ids))
+        for track_id in track_ids:
+            self._job_album_tracks[track_id] = album_id
+
+    def _in_job(self, track_id):
+        return ('track', track_id) in self._job_items or track_id in self._job_album_tracks
+
+    def _downloaded(self, track_id):
+        """Record in its job's manifest that track_id has completely downloaded (and its album, with its last track)."""
+        manifest = self._job_items.pop(('track', track_id), None)
+        if manifest:
+            manifest.mark_done([track_id])
+        album_id = self._job_album_tracks.pop(track_id, None)
+        if album_id in self._job_albums:
+            manifest, pending = self._job_albums[album_id]
+            pending.discard(track_id)
+            if not pending:
+                del self._job_albums[album_id]
+                self._job_items.pop(('album', album_id), None)
+                manifest.mark_done([album_id])
+
+    def _index(self, kind, payloads):
+        """Feed payloads (track/album/artist/playlist) to the offline search index, if enabled."""
+        if self.search_index:
+            try:
+                self.search_index.add_many(kind, payloads)
+            except Exception as e:
+                logging.debug(f"Qobuz: indexing {kind} payloads failed: {e}")
+
+    def _get_stream_data(self, track_id, quality_id):
+        """getFileUrl, served from the look-ahead prefetcher when it already resolved this track."""
+        stream_data = self.prefetcher.get(track_id, quality_id) if self.prefetcher else None
+        return stream_data or self.session.get_file_url(str(track_id), quality_id)
+
+    def _prune_tracks(self, tracks, extra_kwargs):
+        """Drop expanded tracks that aren't streamable, are rejected by the user's track_filter rules or are already
+        in the library index, so none of them costs a getFileUrl call (prefetch included)."""
+        unstreamable = {t for t in tracks if extra_kwargs.get(t, {}).get('streamable') is False}
+        if unstreamable:
+            logging.debug(f"Qobuz: skipping {len(unstreamable)} of {len(tracks)} tracks that aren't streamable: {', '.join(sorted(unstreamable))}")
+            tracks = [t for t in tracks if t not in unstreamable]
+        if self.track_filter:
+            kept = [t for t in tracks if self.track_filter.matches(extra_kwargs.get(t, {}), extra_kwargs.get(t, {}).get('album'))]
+            if len(kept) != len(tracks):
+                logging.debug(f"Qobuz: track_filter dropped {len(tracks) - len(kept)} of {len(tracks)} tracks")
+            tracks = kept
+        if self.library_index:
+            kept = [t for t in tracks if not self._is_archived(t, extra_kwargs.get(t, {}))]
+            if len(kept) != len(tracks):
+                logging.debug(f"Qobuz: {len(tracks) - len(kept)} of {len(tracks)} tracks already archived")
+            tracks = kept
+        return tracks
+
+    def _target_quality(self, track_data, quality_id):
+        """(bit_depth, sample_rate) a download at quality_id would have; (0, 0) for MP3."""
+        if quality_id == 5:
+            return 0, 0
+        stream_data = self._payload_stream_data(track_data, track_data.get('album') or {}, quality_id)
+        return stream_data['bit_depth'], stream_data['sampling_rate']
+
+    def _is_archived(self, track_id, track_data):
+        bit_depth, sample_rate = self._target_quality(track_data, self.quality_parse[self.quality_tier])
+        return self.library_index.has(track_id, track_data.get('isrc'), bit_depth, sample_rate)
+
+    def _prefetch(self, track_ids):
+        if self.prefetcher and self.session.auth_token:
+            self.prefetcher.set_queue(track_ids, self.quality_parse[self.quality_tier])
 
     def _ensure_credentials(self, force=False, status_callback=None):
         """Require valid user credentials before download/metadata that leads to download.
         Without this, only previews would be downloaded. Matches TIDAL behavior: 
         auto-triggers OAuth flow if missing/force=True."""
         if getattr(self.session, 'auth_token', None):
+            self._check_token_async()
             return
-            
+        # The email/pass login below covers what construction deferred
+        self._login_pending = False
+
         settings = self.module_controller.module_settings
         username = (settings.get('username') or '').strip()
         password = (settings.get('password') or '').strip()
@@ -116,6 +478,41 @@ class ModuleInterface:
             # GUI only - allow guest mode for now
             pass
 
+    def _check_token_async(self):
+        """Validate the token in the background when the cached result is stale or a 401 made it suspect, refreshing
+        it only once user/get has rejected it.
+        Callers never wait: in-flight work keeps the current token until a new one is swapped in."""
+        if not self.session.token_ttl or self.session.token_known_valid() or self._token_check_running:
+            return
+        import threading
+
+        self._token_check_running = True
+
+        def _check():
+            try:
+                if not self.session.validate_token():
+                    self._refresh_token()
+            except Exception as e:
+                logging.debug(f"Qobuz: background token check failed: {e}")
+            finally:
+                self._token_check_running = False
+
+        threading.Thread(target=_check, name='qobuz-token-check', daemon=True).start()
+
+    def _refresh_token(self):
+        """Replace a token user/get has rejected using the saved email/password. Without them the token is dropped,
+        so the next _ensure_credentials starts the login flow before a job instead of failing inside a download."""
+        settings = self.module_controller.module_settings
+        username = (settings.get('username') or '').strip()
+        password = (settings.get('password') or '').strip()
+        if username and password:
+            token = self.session.login(username, password)
+            self.module_controller.temporary_settings_controller.set('token', token)
+            logging.debug("Qobuz: expired token refreshed with saved email/password")
+        else:
+            logging.debug("Qobuz: token rejected and no email/password saved, login required")
+            self.session.auth_token = None
+
     def _start_oauth_flow(self, status_callback=None):
         """
         Implementation of Qobuz OAuth flow.
@@ -126,6 +523,12 @@ class ModuleInterface:
             if status_callback: status_callback(msg)
             else: self.module_controller.printer_controller.oprint(f"Qobuz: {msg}")
 
+        # Only needed for the OAuth flow, so not imported with the module
+        import socket
+        import threading
+        import webbrowser
+        from http.server import HTTPServer, BaseHTTPRequestHandler
+
         try:
             # 0. Check if we already have a token to avoid unnecessary flows
             if self.is_authenticated():
@@ -205,8 +608,22 @@ class ModuleInterface:
             _log(f"OAuth Flow Error: {str(e)}")
             return False
 
+    def _deferred_login(self):
+        """Perform the email/pass login skipped at construction, once."""
+        if not self._login_pending:
+            return
+        self._login_pending = False
+        if self.session.auth_token:
+            return
+        settings = self.module_controller.module_settings
+        try:
+            self.login((settings.get('username') or '').strip(), (settings.get('password') or '').strip())
+        except Exception as e:
+            logging.debug(f"Qobuz: deferred email login failed: {e}")
+
     def is_authenticated(self) -> bool:
         """Return True if we have a valid auth token."""
+        self._deferred_login()
         return bool(self.session.auth_token)
 
     def ensure_can_download(self) -> bool:
@@ -253,6 +670,44 @@ class ModuleInterface:
             logging.error(f"Qobuz OAuth login failed: {e}")
             raise e
 
+    def _album_context(self, album_data, refresh=False):
+        """Return the shared AlbumContext for album_data, building it on first use.
+        A cached context is rebuilt when album_data carries more album fields than the payload it was built
+        from (e.g. a full album after a playlist track's album stub); get_album_info always passes refresh=True."""
+        album_id = album_data.get('id', '')
+        richness = sum(1 for key in self.ALBUM_CONTEXT_KEYS if album_data.get(key))
+        cached = self._album_contexts.get(album_id) if album_id and not refresh else None
+        if cached and cached[1] >= richness:
+            # LRU: albums still being downloaded stay cached however many others were seen since
+            self._album_contexts.move_to_end(album_id)
+            return cached[0]
+
+        cover_url = ''
+        if isinstance(album_data.get('image'), dict) and album_data['image'].get('large'):
+            cover_url = album_data['image']['large'].split('_')[0] + '_org.jpg'
+        album_name = (album_data.get('title') or '').rstrip()
+        album_name += f' ({album_data.get("version")})' if album_data.get("version") else ''
+
+        context = AlbumContext(
+            album_id = album_id,
+            album_name = album_name,
+            album_artist = album_data.get('artist', {}).get('name', '') if isinstance(album_data.get('artist'), dict) else '',
+            cover_url = cover_url,
+            release_date = album_data.get('release_date_original'),
+            release_year = int(self._get_year(album_data.get('release_date_original')) or 0),
+            total_tracks = album_data.get('tracks_count'),
+            total_discs = album_data.get('media_count'),
+            upc = album_data.get('upc'),
+            label = album_data.get('label', {}).get('name') if isinstance(album_data.get('label'), dict) else None,
+            copyright = album_data.get('copyright'),
+            genres = (album_data.get('genre', {}).get('name'),) if isinstance(album_data.get('genre'), dict) else (),
+        )
+        if album_id:
+            self._album_contexts[album_id] = (context, richness)
+            while len(self._album_contexts) > 64:
+                self._album_contexts.popitem(last=False)
+        return context
+
     def _get_year(self, date_val):
         if not date_val:
             return None
@@ -268,6 +723,7 @@ class ModuleInterface:
 
     def get_track_info(self, track_id, quality_tier: QualityEnum, codec_options: CodecOptions, data={}):
         self._ensure_credentials()
+        self._hand_off('track', track_id)
         # Resolve proxy IDs (e.g. from Apple Music search) if needed
         # We only do this if we have credentials, which is ensured by the line above.
         if isinstance(data, dict) and data.get('proxy_platform') == 'applemusic':
@@ -287,31 +743,21 @@ class ModuleInterface:
                 # If track_id is not a Qobuz ID (e.g. it's an Apple Music ID),
                 # this will fail. We should ideally handle this better.
                 raise e
+            self._index('track', [track_data])
         album_data = track_data.get('album') or track_data
         if isinstance(album_data, dict) and 'artist' not in album_data and track_data.get('album'):
             album_data = track_data['album']
 
+        album = self._album_context(album_data)
+
         main_artist = track_data.get('performer') or (album_data.get('artist') if isinstance(album_data, dict) else None)
         if not main_artist:
             main_artist = {'name': 'Unknown Artist', 'id': ''}
-        artists = [
-            unicodedata.normalize('NFKD', main_artist['name'])
-            .encode('ascii', 'ignore')
-            .decode('utf-8')
-        ]
-        role_mapping = {
-            'Lyricist': 'Lyricist',
-            'Lyricists': 'Lyricist',
-            'Vocals': 'Lyricist',
-            'Composer': 'Composer',
-            'Composers': 'Composer',
-            'Producer': 'Producer',
-            'Producers': 'Producer'
-        }
+        artists = [_ascii_name(main_artist['name'])]
         if track_data.get('performers'):
             performers = []
             for credit in track_data['performers'].split(' - '):
-                contributor_role = [role_mapping.get(r, r) for r in credit.split(', ')[1:]]
+                contributor_role = [ROLE_MAPPING.get(r, r) for r in credit.split(', ')[1:]]
                 contributor_name = credit.split(', ')[0]
                 for contributor in ['MainArtist', 'FeaturedArtist', 'Artist']:
                     if contributor in contributor_role:
@@ -325,35 +771,28 @@ class ModuleInterface:
             track_data['performers'] = ' - '.join(performers)
         artists[0] = main_artist['name']
 
-        # Extract the primary album artist name.
-        album_artist = album_data.get('artist', {}).get('name', '') if isinstance(album_data.get('artist'), dict) else ''
-
         tags = Tags(
-            album_artist = album_artist,
+            album_artist = album.album_artist,
             composer = track_data.get('composer', {}).get('name') if isinstance(track_data.get('composer'), dict) else None,
-            release_date = album_data.get('release_date_original'),
+            release_date = album.release_date,
             track_number = track_data.get('track_number'),
-            total_tracks = album_data.get('tracks_count'),
+            total_tracks = album.total_tracks,
             disc_number = track_data.get('media_number'),
-            total_discs = album_data.get('media_count'),
+            total_discs = album.total_discs,
             isrc = track_data.get('isrc'),
-            upc = album_data.get('upc'),
-            label = album_data.get('label', {}).get('name') if isinstance(album_data.get('label'), dict) else None,
-            copyright = album_data.get('copyright'),
-            genres = [album_data.get('genre', {}).get('name')] if isinstance(album_data.get('genre'), dict) else [],
+            upc = album.upc,
+            label = album.label,
+            copyright = album.copyright,
+            genres = list(album.genres),
             track_url = f"https://open.qobuz.com/track/{track_id}"
         )
 
-        # track and album title fix to include version tag
+        # track title fix to include version tag
         track_name = f"{track_data.get('work')} - " if track_data.get('work') else ""
         track_name += (track_data.get('title') or '').rstrip()
         track_name += f' ({track_data.get("version")})' if track_data.get("version") else ''
-        album_name = (album_data.get('title') or '').rstrip()
-        album_name += f' ({album_data.get("version")})' if album_data.get("version") else ''
-
-        cover_url = ''
-        if isinstance(album_data.get('image'), dict):
-            cover_url = (album_data['image'].get('large') or '').split('_')[0] + '_org.jpg' if album_data['image'].get('large') else ''
+        album_name = album.album_name
+        cover_url = album.cover_url
 
         # When not authenticated: return display-only TrackInfo (no download URL); expand works, download will raise in get_track_download
         if not getattr(self.session, 'auth_token', None):
@@ -373,7 +812,7 @@ class ModuleInterface:
                 bit_depth=None,
                 bitrate=320,
                 sample_rate=None,
-                release_year=int(self._get_year(album_data.get('release_date_original')) or 0),
+                release_year=album.release_year,
                 explicit=bool(track_data.get('parental_warning')),
                 cover_url=cover_url,
                 tags=tags,
@@ -387,7 +826,12 @@ class ModuleInterface:
 
         quality_tier_id = self.quality_parse[quality_tier]
         try:
-            stream_data = self.session.get_file_url(track_id, quality_tier_id)
+            if self.defer_file_url or track_data.get('streamable') is False:
+                # Quality from the already fetched payload; getFileUrl happens in get_track_download.
+                # Non-streamable tracks never get one: they're reported through TrackInfo.error below.
+                stream_data = self._payload_stream_data(track_data, album_data, quality_tier_id)
+            else:
+                stream_data = self._get_stream_data(track_id, quality_tier_id)
         except Exception as e:
             # If we get a 401 for MP3 (format 5), it might be an API quirk.
             # Don't crash; fall back to basic info and let get_track_download handle it later.
@@ -397,6 +841,16 @@ class ModuleInterface:
             else:
                 raise e
 
+        if self.library_index:
+            # Recorded in the index once the module itself has finished downloading the file (see get_track_download)
+            self._archive_candidates[str(track_id)] = (
+                track_data.get('isrc'),
+                stream_data['bit_depth'] if stream_data.get('format_id') != 5 else 0,
+                stream_data['sampling_rate'] if stream_data.get('format_id') != 5 else 0,
+            )
+            while len(self._archive_candidates) > 1000:
+                self._archive_candidates.popitem(last=False)
+
         bitrate = 320
         if stream_data.get('format_id') in {6, 7, 27}:
             bitrate = int((stream_data['sampling_rate'] * 1000 * stream_data['bit_depth'] * 2) // 1000)
@@ -413,31 +867,105 @@ class ModuleInterface:
             bit_depth=stream_data['bit_depth'],
             bitrate=bitrate,
             sample_rate=stream_data['sampling_rate'],
-            release_year=int(self._get_year(album_data.get('release_date_original')) or 0),
+            release_year=album.release_year,
             explicit=track_data['parental_warning'],
             cover_url=cover_url or (album_data['image']['large'].split('_')[0] + '_org.jpg'),
             tags=tags,
             codec=CodecEnum.FLAC if stream_data.get('format_id') in {6, 7, 27} else CodecEnum.NONE if not stream_data.get('format_id') else CodecEnum.MP3,
             duration=track_data.get('duration'),
             credits_extra_kwargs={'data': {track_id: track_data}},
-            download_extra_kwargs={'url_or_track_id': stream_data.get('url')},
+            download_extra_kwargs={'url_or_track_id': stream_data.get('url') or str(track_id), 'track_id': str(track_id), 'quality_id': quality_tier_id},
             error=f'Track "{track_data["title"]}" is not streamable!' if not track_data.get('streamable') else None
         )
 
-    def get_track_download(self, url_or_track_id, quality_tier=None, codec_options=None, **kwargs):
+    def get_tracks_info(self, track_ids, quality_tier: QualityEnum, codec_options: CodecOptions, data={}):
+        """Batch variant of get_track_info: builds the TrackInfo of every track in one pass, sharing the
+        credentials check and the AlbumContext of each album among its tracks.
+
+        Payloads missing from data are fetched per track until two of them turn out to share an album;
+        that album is then fetched once and its track list fills in every other missing track of it."""
+        self._ensure_credentials()
+        data = dict(data or {})
+        missing = {str(t): t for t in track_ids if t not in data}
+        seen_albums, expanded_albums = set(), set()
+        for track_id in missing.values():
+            if track_id in data:
+                continue
+            track_data = self.session.get_track(track_id)
+            data[track_id] = track_data
+            album_id = str((track_data.get('album') or {}).get('id') or '')
+            if not album_id or album_id in expanded_albums:
+                continue
+            if album_id not in seen_albums:
+                seen_albums.add(album_id)
+                continue
+            expanded_albums.add(album_id)
+            album_data = self.session.get_album(album_id)
+            album_tracks = (album_data.pop('tracks', None) or {}).get('items') or []
+            self._index('album', [album_data])
+            for track in album_tracks:
+                track_id = missing.get(str(track.get('id')))
+                if track_id is not None and track_id not in data:
+                    track['album'] = album_data
+                    data[track_id] = track
+        self._index('track', [data[t] for t in missing.values()])
+        return [self.get_track_info(track_id, quality_tier, codec_options, data=data) for track_id in track_ids]
+
+    @staticmethod
+    def _payload_stream_data(track_data, album_data, quality_id):
+        """Predict what getFileUrl would report for quality_id from the track/album payload alone."""
+        if quality_id == 5:
+            return {'bit_depth': 16, 'sampling_rate': 44.1, 'format_id': 5, 'url': None}
+
+        bit_depth = track_data.get('maximum_bit_depth') or album_data.get('maximum_bit_depth') or 16
+        sample_rate = track_data.get('maximum_sampling_rate') or album_data.get('maximum_sampling_rate') or 44.1
+        hires = track_data.get('hires_streamable', album_data.get('hires_streamable'))
+        if quality_id == 27 and hires and bit_depth > 16:
+            # 7 = 24-bit up to 96kHz, 27 = above 96kHz
+            return {'bit_depth': bit_depth, 'sampling_rate': sample_rate, 'format_id': 27 if sample_rate > 96 else 7, 'url': None}
+        return {'bit_depth': 16, 'sampling_rate': 44.1, 'format_id': 6, 'url': None}
+
+    def get_track_download(self, url_or_track_id, quality_tier=None, codec_options=None, track_id=None, quality_id=None, **kwargs):
         # Called either as get_track_download(url) from download_extra_kwargs or get_track_download(track_id, quality_tier, codec_options) from core fallback
         if isinstance(url_or_track_id, str) and url_or_track_id.startswith('http'):
             url = url_or_track_id
         else:
             self._ensure_credentials()
             track_id = url_or_track_id
-            quality_id = self.quality_parse.get(quality_tier, 5) if quality_tier is not None else 5
-            stream_data = self.session.get_file_url(str(track_id), quality_id)
+            if quality_id is None:
+                quality_id = self.quality_parse.get(quality_tier, 5) if quality_tier is not None else 5
+            stream_data = self._get_stream_data(track_id, quality_id)
             url = stream_data.get('url')
+
+        connections = int(self.module_controller.module_settings.get('download_connections') or 1)
+        # Tracks of checkpointed jobs, and every track while the library index is on, are downloaded here too:
+        # only then does the module know the download has completely arrived
+        if url and track_id and (connections > 1 or self.library_index or self._in_job(str(track_id))):
+            return self._download_segmented(url, str(track_id), quality_id, max(connections, 1))
         return TrackDownloadInfo(download_type=DownloadEnum.URL, file_url=url)
 
+    def _download_segmented(self, url, track_id, quality_id, connections):
+        """Fetch the stream in parallel Range segments into a resumable partial file."""
+        from .downloader import SegmentedDownloader
+
+        download_dir = self._data_path('downloads')
+        os.makedirs(download_dir, exist_ok=True)
+        # Stable name per track and quality so a crashed run picks up the same partial file
+        dest_path = os.path.join(download_dir, f'{track_id}_{quality_id}.part')
+
+        def _refresh_url():
+            return self.session.get_file_url(track_id, quality_id or 5).get('url')
+
+        SegmentedDownloader(connections).download(url, dest_path, refresh_url=_refresh_url)
+        self._downloaded(track_id)
+        if self.library_index and track_id in self._archive_candidates:
+            isrc, bit_depth, sample_rate = self._archive_candidates.pop(track_id)
+            self.library_index.add(track_id, isrc, bit_depth, sample_rate)
+        return TrackDownloadInfo(download_type=DownloadEnum.TEMP_FILE_PATH, temp_file_path=dest_path)
+
     def get_album_info(self, album_id):
         self._ensure_credentials()
+        self._hand_off('album', album_id)
         album_data = self.session.get_album(album_id)
 
         booklet_url = None
@@ -453,6 +981,11 @@ class ModuleInterface:
             tracks.append(track_id)
             track['album'] = album_data
             extra_kwargs[track_id] = track
+        self._index('album', [album_data])
+        self._index('track', extra_kwargs.values())
+        tracks = self._prune_tracks(tracks, extra_kwargs)
+        self._track_album_job(str(album_id), tracks)
+        self._prefetch(tracks)
 
         # get the wanted quality for an actual album quality_format string
         quality_tier = self.quality_parse[self.quality_tier]
@@ -466,9 +999,8 @@ class ModuleInterface:
             'bit_depth': bit_depth
         }
 
-        # album title fix to include version tag
-        album_name = album_data.get('title').rstrip()
-        album_name += f' ({album_data.get("version")})' if album_data.get("version") else ''
+        # album title (with version tag), cover and year are shared with every track's TrackInfo
+        album = self._album_context(album_data, refresh=True)
 
         album_quality = self.quality_format.format(**quality_tags) if self.quality_format != '' else None
         if sample_rate == 44.1 and (bit_depth == 16 or bit_depth == 24):
@@ -479,15 +1011,15 @@ class ModuleInterface:
                 album_quality = f'🅷 HI-RES / {album_quality}'
 
         return AlbumInfo(
-            name = album_name,
+            name = album.album_name,
             artist = album_data['artist']['name'],
             artist_id = album_data['artist']['id'],
             tracks = tracks,
-            release_year = int(self._get_year(album_data.get('release_date_original')) or 0),
+            release_year = album.release_year,
             explicit = album_data['parental_warning'],
             quality = album_quality,
             description = album_data.get('description'),
-            cover_url = album_data['image']['large'].split('_')[0] + '_org.jpg',
+            cover_url = album.cover_url,
             all_track_cover_jpg_url = album_data['image']['large'],
             upc = album_data.get('upc'),
             duration = album_data.get('duration'),
@@ -497,41 +1029,63 @@ class ModuleInterface:
 
     def get_playlist_info(self, playlist_id):
         self._ensure_credentials()
-        # Fetch first batch to get total track count
-        playlist_data = self.session.get_playlist(playlist_id)
-
-        
-        tracks, extra_kwargs = [], {}
-        
-        # Process first batch of tracks
-        for track in playlist_data['tracks']['items']:
-            track_id = str(track['id'])
-            extra_kwargs[track_id] = track
-            tracks.append(track_id)
-        
-        # Check if there are more tracks to fetch (pagination)
-        total_tracks = playlist_data['tracks'].get('total', len(playlist_data['tracks']['items']))
-        fetched_tracks = len(playlist_data['tracks']['items'])
-        
-        # Fetch remaining tracks if playlist has more than initial batch
-        if fetched_tracks < total_tracks:
-            offset = fetched_tracks
-            limit = 500  # Qobuz API limit per request
-            
-            while offset < total_tracks:
-                # Fetch next batch
-                batch_data = self.session.get_playlist(playlist_id, limit=limit, offset=offset)
-                
-                if not batch_data['tracks']['items']:
-                    break  # No more tracks to fetch
-                
-                # Process batch tracks
-                for track in batch_data['tracks']['items']:
-                    track_id = str(track['id'])
-                    extra_kwargs[track_id] = track
-                    tracks.append(track_id)
-                
-                offset += len(batch_data['tracks']['items'])
+        manifest = self._job_manifest('playlist', playlist_id)
+        sync_state = None
+        if manifest and manifest.expansion:
+            # Resumed job: paging and payloads come from the checkpoint, finished tracks are left out
+            playlist_data, tracks = manifest.expansion['entity'], manifest.remaining()
+            extra_kwargs = {t: manifest.expansion['data'][t] for t in tracks}
+        elif self.incremental_sync:
+            # Only the tracks added since the last run are returned
+            sync = self.sync_playlist(playlist_id, save=False)
+            playlist_data, tracks, sync_state = sync['playlist'], sync['added'], sync['sync_state']
+            extra_kwargs = {t: sync['data'][t] for t in tracks if t in sync['data']}
+        else:
+            # Fetch first batch to get total track count
+            playlist_data = self.session.get_playlist(playlist_id, extra=self.PLAYLIST_EXTRAS)
+
+            tracks, extra_kwargs = [], {}
+
+            # Process first batch of tracks
+            for track in playlist_data['tracks']['items']:
+                track_id = str(track['id'])
+                extra_kwargs[track_id] = track
+                tracks.append(track_id)
+
+            # Check if there are more tracks to fetch (pagination)
+            total_tracks = playlist_data['tracks'].get('total', len(playlist_data['tracks']['items']))
+            fetched_tracks = len(playlist_data['tracks']['items'])
+
+            # Fetch remaining tracks if playlist has more than initial batch
+            if fetched_tracks < total_tracks:
+                offset = fetched_tracks
+                limit = 500  # Qobuz API limit per request
+
+                while offset < total_tracks:
+                    # Fetch next batch
+                    batch_data = self.session.get_playlist(playlist_id, limit=limit, offset=offset, extra=self.PLAYLIST_EXTRAS)
+
+                    if not batch_data['tracks']['items']:
+                        break  # No more tracks to fetch
+
+                    # Process batch tracks
+                    for track in batch_data['tracks']['items']:
+                        track_id = str(track['id'])
+                        extra_kwargs[track_id] = track
+                        tracks.append(track_id)
+
+                    offset += len(batch_data['tracks']['items'])
+
+        if manifest and not manifest.expansion:
+            manifest.expand({k: v for k, v in playlist_data.items() if k != 'tracks'}, tracks, extra_kwargs, sync_state=sync_state)
+        self._commit_sync(manifest, sync_state)
+        self._index('playlist', [playlist_data])
+        self._index('track', extra_kwargs.values())
+        expanded = tracks
+        tracks = self._prune_tracks(tracks, extra_kwargs)
+        if manifest:
+            self._track_job('track', manifest, expanded, tracks)
+        self._prefetch(tracks)
 
         return PlaylistInfo(
             name = playlist_data['name'],
@@ -544,31 +1098,160 @@ class ModuleInterface:
             track_extra_kwargs = {'data': extra_kwargs}
         )
 
-    def get_artist_info(self, artist_id, get_credited_albums):
-        self._ensure_credentials()
-        artist_data = self.session.get_artist(artist_id)
+    def sync_playlist(self, playlist_id, save=True):
+        """Incremental playlist sync against a persisted fingerprint of the last seen state.
+
+        Only the first page is fetched when tracks.total, updated_at and the first page's hash are
+        unchanged. Otherwise every page is fetched and diffed against the stored track ids by id and
+        position: a track is added (or removed) for each occurrence beyond those in the old (new) list,
+        so replaced, appended and duplicated tracks are all accounted for while a reorder adds nothing.
+        Returns a dict with the first page payload, the full track id list, the added and removed
+        track ids, the payloads of the tracks that were fetched and the new fingerprint as a
+        (key, state) sync_state (None when unchanged), which is saved here unless save=False."""
+        store = JsonStore(self._data_path('sync'))
+        key = f'playlist_{playlist_id}'
+        state = store.load(key)
+        page_size = self.PLAYLIST_PAGE_SIZE
+
+        def _page_ids(page):
+            return [str(t['id']) for t in page['tracks']['items']]
+
+        def _page_hash(ids):
+            return hashlib.sha1(','.join(ids).encode()).hexdigest()
+
+        playlist_data = self.session.get_playlist(playlist_id, limit=page_size, extra=self.PLAYLIST_EXTRAS)
+        total = playlist_data['tracks'].get('total', len(playlist_data['tracks']['items']))
+        data = {str(t['id']): t for t in playlist_data['tracks']['items']}
+        pages = [_page_ids(playlist_data)]
+        result = {'playlist': playlist_data, 'data': data, 'added': [], 'removed': [], 'sync_state': None}
+
+        if state and state['page_size'] == page_size and state['pages'][:1] == [_page_hash(pages[0])] \
+                and state['total'] == total and state['updated_at'] == playlist_data.get('updated_at'):
+            result['tracks'] = state['track_ids']
+            return result
+
+        offset = len(pages[0])
+        while offset < total:
+            batch_data = self.session.get_playlist(playlist_id, limit=page_size, offset=offset, extra=self.PLAYLIST_EXTRAS)
+            if not batch_data['tracks']['items']:
+                break  # No more tracks to fetch
+            pages.append(_page_ids(batch_data))
+            data.update({str(t['id']): t for t in batch_data['tracks']['items']})
+            offset += len(batch_data['tracks']['items'])
+
+        track_ids = [t for page in pages for t in page]
+        old_track_ids = state['track_ids'] if state else []
+        result['tracks'] = track_ids
+        result['added'] = self._surplus(track_ids, old_track_ids)
+        result['removed'] = self._surplus(old_track_ids, track_ids)
+
+        result['sync_state'] = (key, {
+            'page_size': page_size,
+            'total': total,
+            'updated_at': playlist_data.get('updated_at'),
+            'pages': [_page_hash(page) for page in pages],
+            'track_ids': track_ids,
+        })
+        if save:
+            store.save(*result['sync_state'])
+        logging.debug(f"Qobuz: playlist {playlist_id} sync: {len(result['added'])} added, {len(result['removed'])} removed")
+        return result
+
+    @staticmethod
+    def _surplus(track_ids, other_ids):
+        """Entries of track_ids, in order, beyond the occurrences of the same id in other_ids."""
+        remaining = Counter(other_ids)
+        surplus = []
+        for track_id in track_ids:
+            if remaining[track_id]:
+                remaining[track_id] -= 1
+            else:
+                surplus.append(track_id)
+        return surplus
+
+    def _filter_albums(self, albums_raw):
+        """Drop listed albums rejected by the album_filter rules, using only the fields of the listing payload."""
+        if not self.album_filter:
+            return albums_raw
+        kept = [a for a in albums_raw if not isinstance(a, dict) or self.album_filter.matches(a)]
+        if len(kept) != len(albums_raw):
+            logging.debug(f"Qobuz: album_filter dropped {len(albums_raw) - len(kept)} of {len(albums_raw)} albums")
+        return kept
+
+    def _backfill_albums(self, albums_raw):
+        """Fill in tracks_count/duration of listed albums from album/get, using worker processes for big catalogues."""
+        missing_metadata = {}
+        for idx, a in enumerate(albums_raw):
+            if isinstance(a, dict) and (not a.get('tracks_count') or not a.get('duration')):
+                missing_metadata.setdefault(str(a['id']), []).append(idx)
+        if not missing_metadata:
+            return
+        for album_id, full_data in self._fetch_albums(list(missing_metadata), Priority.BACKGROUND):
+            if full_data:
+                for idx in missing_metadata[str(album_id)]:
+                    albums_raw[idx].update(full_data)
+
+    def _fetch_albums(self, album_ids, priority=Priority.DOWNLOAD):
+        """(album id, album/get payload or None) for every id, as they arrive; sharded over worker
+        processes for big catalogues, otherwise fetched on a few threads, 50 at a time so a huge
+        catalogue is never held in memory at once."""
+        if self.worker_processes > 1 and len(album_ids) >= self.SHARDED_BACKFILL_MIN:
+            from .runner import ShardedRunner
+            runner = ShardedRunner(self.session, self.worker_processes, self._data_path('album_cache'),
+                                   requests_per_second=self.worker_rate_limit)
+            return runner.iter_albums(album_ids)
+
+        def _fetch_qobuz_album_meta(aid):
+            try:
+                return self.session.get_album(aid, priority=priority)
+            except: pass
+            return None
 
-        albums_raw = (artist_data.get('albums') or {}).get('items') or []
-        
-        # Batch fetch missing album metadata (tracks_count and duration)
-        missing_metadata = [idx for idx, a in enumerate(albums_raw) if isinstance(a, dict) and (not a.get('tracks_count') or not a.get('duration'))]
-        if missing_metadata:
-            a_meta = {}
-            def _fetch_qobuz_album_meta(aid):
-                try:
-                    return aid, self.session.get_album(aid)
-                except: pass
-                return aid, None
+        def _batches():
+            for start in range(0, len(album_ids), 50):
+                batch = album_ids[start:start + 50]
+                yield from zip(batch, Deadline().map(self._task('album_backfill', _fetch_qobuz_album_meta), batch, max_workers=5))
 
-            with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-                fetch_ids = [albums_raw[idx]['id'] for idx in missing_metadata]
-                for aid, full_data in executor.map(_fetch_qobuz_album_meta, fetch_ids):
-                    if full_data: a_meta[str(aid)] = full_data
-            
-            for idx in missing_metadata:
-                aid = str(albums_raw[idx]['id'])
-                if aid in a_meta:
-                    albums_raw[idx].update(a_meta[aid])
+        return _batches()
+
+    @staticmethod
+    def _album_key(album):
+        return str(album['id']) if isinstance(album, dict) else str(album)
+
+    def _checkpoint_albums(self, manifest, entity_data, albums_raw, sync_state=None):
+        """Record an artist/label expansion, with the backfilled album payloads, in its job manifest."""
+        album_ids = [self._album_key(a) for a in albums_raw]
+        manifest.expand({k: v for k, v in entity_data.items() if k != 'albums'}, album_ids,
+                        {self._album_key(a): a for a in albums_raw}, sync_state=sync_state)
+        self._track_job('album', manifest, album_ids, album_ids)
+
+    def _resume_albums(self, manifest):
+        """(entity payload, unfinished album payloads) of an interrupted artist/label job."""
+        remaining = manifest.remaining()
+        self._track_job('album', manifest, remaining, remaining)
+        return manifest.expansion['entity'], [manifest.expansion['data'][a] for a in remaining]
+
+    def get_artist_info(self, artist_id, get_credited_albums):
+        self._ensure_credentials()
+        manifest = self._job_manifest('artist', artist_id)
+        if manifest and manifest.expansion:
+            artist_data, albums_raw = self._resume_albums(manifest)
+        else:
+            artist_data = self.session.get_artist(artist_id, extra=self.ARTIST_EXTRAS)
+
+            albums_raw, sync_state = (artist_data.get('albums') or {}).get('items') or [], None
+            if self.incremental_sync:
+                albums_raw, sync_state = self._sync_albums('artist', artist_id, artist_data.get('albums') or {},
+                    lambda offset: self.session.get_artist(artist_id, offset=offset, extra=self.ARTIST_EXTRAS).get('albums'))
+
+            # Batch fetch missing album metadata (tracks_count and duration) of the albums we keep
+            albums_raw = self._filter_albums(albums_raw)
+            self._backfill_albums(albums_raw)
+            self._index('album', albums_raw)
+            if manifest:
+                self._checkpoint_albums(manifest, artist_data, albums_raw, sync_state)
+            self._commit_sync(manifest, sync_state)
+            self._index('artist', [artist_data])
 
         albums_out = []
 
@@ -655,8 +1338,9 @@ class ModuleInterface:
                 'explicit': bool(album.get('parental_warning')),
             })
 
-        # Fallback: if we couldn't parse metadata, keep old behaviour (IDs only)
-        if not albums_out:
+        # Fallback: if we couldn't parse metadata, keep old behaviour (IDs only). Not when album_filter ran:
+        # an empty result then means every album was rejected
+        if not albums_out and not self.incremental_sync and not self.album_filter:
             albums_out = [str(album['id']) for album in artist_data.get('albums', {}).get('items', [])]
 
         return ArtistInfo(
@@ -667,30 +1351,26 @@ class ModuleInterface:
     def get_label_info(self, label_id: str, get_credited_albums: bool = True, **kwargs) -> ArtistInfo:
         self._ensure_credentials()
         """Return label metadata and albums as ArtistInfo (same shape as artist for download flow)."""
-        label_data = self.session.get_label(label_id)
+        manifest = self._job_manifest('label', label_id)
+        if manifest and manifest.expansion:
+            label_data, albums_raw = self._resume_albums(manifest)
+        else:
+            label_data = self.session.get_label(label_id)
 
-        label_name = label_data.get('name') or 'Unknown Label'
-        albums_raw = (label_data.get('albums') or {}).get('items') or []
-        
-        # Batch fetch missing album metadata (tracks_count and duration)
-        missing_metadata = [idx for idx, a in enumerate(albums_raw) if isinstance(a, dict) and (not a.get('tracks_count') or not a.get('duration'))]
-        if missing_metadata:
-            a_meta = {}
-            def _fetch_qobuz_album_meta(aid):
-                try:
-                    return aid, self.session.get_album(aid)
-                except: pass
-                return aid, None
+            albums_raw, sync_state = (label_data.get('albums') or {}).get('items') or [], None
+            if self.incremental_sync:
+                albums_raw, sync_state = self._sync_albums('label', label_id, label_data.get('albums') or {},
+                    lambda offset: self.session.get_label(label_id, offset=offset).get('albums'))
 
-            with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-                fetch_ids = [albums_raw[idx]['id'] for idx in missing_metadata]
-                for aid, full_data in executor.map(_fetch_qobuz_album_meta, fetch_ids):
-                    if full_data: a_meta[str(aid)] = full_data
-            
-            for idx in missing_metadata:
-                aid = str(albums_raw[idx]['id'])
-                if aid in a_meta:
-                    albums_raw[idx].update(a_meta[aid])
+            # Batch fetch missing album metadata (tracks_count and duration) of the albums we keep
+            albums_raw = self._filter_albums(albums_raw)
+            self._backfill_albums(albums_raw)
+            self._index('album', albums_raw)
+            if manifest:
+                self._checkpoint_albums(manifest, label_data, albums_raw, sync_state)
+            self._commit_sync(manifest, sync_state)
+
+        label_name = label_data.get('name') or 'Unknown Label'
 
         albums_out = []
 
@@ -760,7 +1440,7 @@ class ModuleInterface:
                 'additional': additional,
             })
 
-        if not albums_out:
+        if not albums_out and not self.incremental_sync and not self.album_filter:
             albums_out = [str(a['id']) for a in (label_data.get('albums') or {}).get('items', [])]
 
         return ArtistInfo(
@@ -769,179 +1449,280 @@ class ModuleInterface:
             albums=albums_out,
         )
 
+    def export_metadata(self, entities, output_dir, fmt='jsonl'):
+        """Stream normalised album and track records (IDs, ISRC/UPC, quality, credits, durations) of
+        label/artist/playlist expansions to albums.<fmt> and tracks.<fmt> in output_dir.
+
+        entities: iterable of (kind, id) with kind 'label', 'artist' or 'playlist'. fmt is 'jsonl' or
+        'parquet' (needs pyarrow). Payloads are written page by page and then dropped, and albums/tracks
+        shared between entities are exported once. Returns the number of exported albums and tracks."""
+        from .export import MetadataExporter
+
+        self._ensure_credentials()
+        with MetadataExporter(output_dir, fmt) as exporter:
+            for kind, entity_id in entities:
+                if kind == 'playlist':
+                    for track in self._iter_playlist_tracks(entity_id):
+                        album_data = track.get('album') or {}
+                        exporter.add_album_stub(album_data)
+                        exporter.add_track(track, album_data.get('id'), _parse_credits(track.get('performers')))
+                    continue
+                album_ids = [self._album_key(a) for a in self._iter_albums(kind, entity_id)]
+                for album_id, album_data in self._fetch_albums([a for a in album_ids if not exporter.album_expanded(a)]):
+                    if not album_data:
+                        logging.debug(f"Qobuz: export of album {album_id} failed")
+                        continue
+                    tracks = (album_data.pop('tracks', None) or {}).get('items') or []
+                    exporter.add_album(album_data)
+                    for track in tracks:
+                        exporter.add_track(track, album_id, _parse_credits(track.get('performers')))
+            logging.debug(f"Qobuz: exported {exporter.counts} to {output_dir}")
+            return exporter.counts
+
+    def _iter_albums(self, kind, entity_id):
+        """Album listing payloads of a label/artist, one page at a time."""
+        if kind == 'label':
+            fetch_page = lambda offset: self.session.get_label(entity_id, offset=offset).get('albums')
+        elif kind == 'artist':
+            fetch_page = lambda offset: self.session.get_artist(entity_id, offset=offset, extra=self.ARTIST_EXTRAS).get('albums')
+        else:
+            raise ValueError(f'cannot export "{kind}", expected label, artist or playlist')
+        offset = 0
+        while True:
+            page = fetch_page(offset) or {}
+            items = page.get('items') or []
+            yield from items
+            offset += len(items)
+            if not items or offset >= (page.get('total') or 0):
+                break
+
+    def _iter_playlist_tracks(self, playlist_id):
+        """Track payloads of a playlist, one page at a time."""
+        offset = 0
+        while True:
+            page = self.session.get_playlist(playlist_id, limit=self.PLAYLIST_PAGE_SIZE, offset=offset, extra=self.PLAYLIST_EXTRAS)['tracks']
+            items = page.get('items') or []
+            yield from items
+            offset += len(items)
+            if not items or offset >= (page.get('total') or 0):
+                break
+
     def get_track_credits(self, track_id, data=None):
         track_data = data.get(track_id) if data else None
         if not track_data or not track_data.get('performers'):
             track_data = self.session.get_track(track_id)
 
-        track_contributors = track_data.get('performers')
-
-        # Normalize roles to standard tagging keys
-        role_mapping = {
-            'Lyricist': 'Lyricist',
-            'Lyricists': 'Lyricist',
-            'Vocals': 'Lyricist',
-            'Composer': 'Composer',
-            'Composers': 'Composer',
-            'Producer': 'Producer',
-            'Producers': 'Producer'
-        }
-
-        # Credits look like: {name}, {type1}, {type2} - {name2}, {type2}
-        credits_dict = {}
-        if track_contributors:
-            for credit in track_contributors.split(' - '):
-                contributor_role = [role_mapping.get(r, r) for r in credit.split(', ')[1:]]
-                contributor_name = credit.split(', ')[0]
-
-                for role in contributor_role:
-                    # Check if the dict contains no list, create one
-                    if role not in credits_dict:
-                        credits_dict[role] = []
-                    # Now add the name to the type list
-                    if contributor_name not in credits_dict[role]:
-                        credits_dict[role].append(contributor_name)
+        credits_dict = _parse_credits(track_data.get('performers'))
 
         # Convert the dictionary back to a list of CreditsInfo
         return [CreditsInfo(k, v) for k, v in credits_dict.items()]
 
-    def search(self, query_type: DownloadTypeEnum, query, track_info: TrackInfo = None, limit: int = 10):
-        # Fallback to Public Web App ID for guest searching if the primary one is restricted.
-        GUEST_APP_ID = '712109809'
-        GUEST_APP_SECRET = '589be88e4538daea11f509d29e4a23b1'
-        
-        results = {}
-        if track_info and track_info.tags.isrc:
-            try:
-                results = self.session.search(query_type.name, track_info.tags.isrc, limit)
-            except Exception as e:
-                # If we get a 401, it might be a stale token or restricted App ID. Try guest fallback.
-                is_401 = '"code":401' in str(e) or "authentication is required" in str(e).lower()
-                if is_401:
-                    orig_token = self.session.auth_token
-                    orig_app_id = self.session.app_id
-                    orig_app_secret = self.session.app_secret
-                    
-                    self.session.auth_token = None
-                    self.session.app_id = GUEST_APP_ID
-                    self.session.app_secret = GUEST_APP_SECRET
-                    try:
-                        results = self.session.search(query_type.name, track_info.tags.isrc, limit)
-                    except Exception:
-                        results = {}
-                    finally:
-                        # Restore original credentials for potential future download attempts
-                        self.session.auth_token = orig_token
-                        self.session.app_id = orig_app_id
-                        self.session.app_secret = orig_app_secret
-                else:
-                    raise
+    def search(self, query_type: DownloadTypeEnum, query, track_info: TrackInfo = None, limit: int = 10, deadline: float = None):
+        """deadline: latency budget in seconds for the whole call (defaults to the 'search_deadline' setting).
+        Stages that don't fit are skipped or cut short and whatever finished in time is returned."""
+        # Saved email/password: search as that user, as before login was deferred to first use
+        self._deferred_login()
+        deadline = Deadline(deadline if deadline is not None else self.search_deadline)
+        isrc = track_info.tags.isrc if track_info and track_info.tags else None
+        cache_key = (
+            ' '.join(unicodedata.normalize('NFKC', str(query)).casefold().split()),
+            query_type.name, limit, isrc,
+            'auth' if self.session.auth_token else 'guest', self.session.app_id,
+        )
+        if self.search_cache:
+            cached = self.search_cache.get(cache_key)
+            # Results of a fallback tier only stand while the better tiers are still failing
+            if cached is not None and not self._better_tier_recovered(cached[1]):
+                return list(cached[0])
+
+        if self.search_index:
+            # Offline index first; online only on a miss (or never, in 'local' mode)
+            max_age = self.search_index_max_age if self.search_mode == 'local_first' else None
+            items_raw = self.search_index.search(query_type.name, isrc, limit, max_age) if isrc else []
+            items_raw = items_raw or self.search_index.search(query_type.name, str(query), limit, max_age)
+            # 'local_first' only answers from the index with a full page; fewer hits may just be the few items seen
+            if len(items_raw) >= limit or (items_raw and self.search_mode == 'local'):
+                items = self._format_search_items(items_raw, query_type, deadline, backfill=self.search_mode != 'local',
+                                                  previews=False)
+                self._index(query_type.name, items_raw)
+                return items
+            if self.search_mode == 'local':
+                return []
 
+        results, tier = {}, None
+        if isrc:
+            results, tier = self._search_with_fallback(query_type, isrc, limit, deadline, proxy_fallback=False)
         if not results:
+            results, tier = self._search_with_fallback(query_type, query, limit, deadline)
+
+        if tier == 'applemusic':
+            # Another module's search can't take our deadline: run it in a worker and stop waiting when the budget runs out
+            proxy = lambda _: self._search_apple_music_proxy(query_type, query, limit)
+            items = (deadline.map(self._task('applemusic_proxy', proxy), [None], max_workers=1)[0] or []) if not deadline.expired() else []
+        elif not results:
+            items = []
+        else:
+            result_key = query_type.name + 's'
+            if result_key not in results or not results[result_key].get('items'):
+                items_raw = []
+            else:
+                items_raw = results[result_key]['items']
+            # API returns no labels; use Download tab with label URL (e.g. play.qobuz.com/label/12444)
+            items = self._format_search_items(items_raw, query_type, deadline) if items_raw else []
+            self._index(query_type.name, items_raw)
+
+        # The proxy returns [] on any failure, and deadline-cut results lack enrichment: don't keep those around
+        if self.search_cache and (items or tier != 'applemusic') and not deadline.expired():
+            self.search_cache.set(cache_key, (items, tier))
+        return list(items)
+
+    def _credential_key(self):
+        token = self.session.auth_token
+        return hashlib.sha1(token.encode()).hexdigest()[:12] if token else 'guest'
+
+    def _better_tier_recovered(self, tier):
+        """True if a credential tier ahead of `tier` (auth, then guest) is no longer failing, so searching again may do better."""
+        credential = self._credential_key()
+        better = {'guest': ['auth'], 'applemusic': ['auth', 'guest']}.get(tier, [])
+        if not self.session.auth_token and 'auth' in better:
+            better.remove('auth')
+        return any(not self.search_breaker.is_open((credential, 'catalog/search', t)) for t in better)
+
+    def _search_with_fallback(self, query_type, query, limit, deadline, proxy_fallback=True):
+        """catalog/search through the credential tiers (user token, public web player app, Apple Music proxy).
+        Returns (results, tier) where tier is the one that answered ('applemusic' means use the proxy).
+        Tiers that recently failed with an auth error are skipped by the circuit breaker and probed in the background."""
+        def _is_auth_error(e):
+            err_msg = str(e).lower()
+            return '"code":401' in err_msg or '"code":400' in err_msg or "authentication" in err_msg or "invalid app_id" in err_msg
+
+        credential = self._credential_key()
+        auth_key = (credential, 'catalog/search', 'auth')
+        guest_key = (credential, 'catalog/search', 'guest')
+        probe_auth = lambda: self.session.search(query_type.name, query, limit)
+        probe_guest = lambda: self.session.search(query_type.name, query, limit, guest=True)
+
+        if deadline.expired():
+            return {}, 'guest'
+
+        # Only auth errors say a tier is broken: a probe hitting a timeout or network error leaves the breaker as it is
+        if self.session.auth_token and self.search_breaker.allow(auth_key, probe_auth, is_failure=_is_auth_error):
             try:
-                results = self.session.search(query_type.name, query, limit)
+                results = self.session.search(query_type.name, query, limit, timeout=deadline.timeout(15))
+                self.search_breaker.record_success(auth_key)
+                return results, 'auth'
             except Exception as e:
                 # If we get a 401, it might be a stale token or restricted App ID. Try guest fallback.
                 is_401 = '"code":401' in str(e) or "authentication is required" in str(e).lower()
-                if is_401:
-                    orig_token = self.session.auth_token
-                    orig_app_id = self.session.app_id
-                    orig_app_secret = self.session.app_secret
-                    
-                    self.session.auth_token = None
-                    self.session.app_id = GUEST_APP_ID
-                    self.session.app_secret = GUEST_APP_SECRET
-                    try:
-                        results = self.session.search(query_type.name, query, limit)
-                    except Exception as e2:
-                        # Even GUEST_APP_ID failed (401 or 400). Fallback to Apple Music Search Proxy.
-                        err_msg = str(e2).lower()
-                        is_auth_error = '"code":401' in err_msg or '"code":400' in err_msg or "authentication" in err_msg or "invalid app_id" in err_msg
-                        if is_auth_error:
-                            logging.debug("Qobuz: Guest search restricted. Falling back to Apple Music Search Proxy.")
-                            return self._search_apple_music_proxy(query_type, query, limit)
-                        results = {}
-                    finally:
-                        # Restore original credentials for potential future download attempts
-                        self.session.auth_token = orig_token
-                        self.session.app_id = orig_app_id
-                        self.session.app_secret = orig_app_secret
-                elif query_type is DownloadTypeEnum.label:
-                    return []  # catalog/search does not support type=labels; use Download tab with label URL
-                else:
+                if not is_401:
+                    if query_type is DownloadTypeEnum.label:
+                        return {}, 'auth'  # catalog/search does not support type=labels; use Download tab with label URL
                     raise
+                self.search_breaker.record_failure(auth_key)
 
-        if not results:
-            return []
+        if deadline.expired():
+            return {}, 'guest'
 
-        result_key = query_type.name + 's'
-        if result_key not in results or not results[result_key].get('items'):
-            if query_type is DownloadTypeEnum.label:
-                return []  # API returns no labels; use Download tab with label URL (e.g. play.qobuz.com/label/12444)
-            items_raw = []
-        else:
-            items_raw = results[result_key]['items']
+        if self.search_breaker.allow(guest_key, probe_guest, is_failure=_is_auth_error):
+            try:
+                results = self.session.search(query_type.name, query, limit, guest=True, timeout=deadline.timeout(15))
+                self.search_breaker.record_success(guest_key)
+                return results, 'guest'
+            except Exception as e2:
+                # Even the guest app id failed (401 or 400). Fallback to Apple Music Search Proxy.
+                if not _is_auth_error(e2):
+                    return {}, 'guest'
+                self.search_breaker.record_failure(guest_key)
+
+        if proxy_fallback and not deadline.expired():
+            logging.debug("Qobuz: Guest search restricted. Falling back to Apple Music Search Proxy.")
+            return {}, 'applemusic'
+        return {}, 'guest'
+
+    def _itunes_previews(self, tracks, deadline):
+        """{track id: preview URL} from the iTunes Search API for tracks without a native preview.
+
+        Answers, including "no preview", are cached per Qobuz track id across runs. Lookups that are
+        still needed are deduplicated by search term and sent concurrently over one pooled session."""
+        if self.preview_cache is None and self.preview_cache_ttl > 0:
+            self.preview_cache = SqliteTTLCache(self._data_path('previews.db'), ttl=self.preview_cache_ttl)
+        previews, terms = {}, {}
+        for i in tracks:
+            track_id = str(i['id'])
+            cached = self.preview_cache.get(track_id) if self.preview_cache else None
+            if cached is not None:
+                if cached:
+                    previews[track_id] = cached
+                continue
+            artist = i.get('performer', {}).get('name') or i.get('album', {}).get('artist', {}).get('name', '')
+            terms.setdefault(f"{artist} {i.get('title', '')}".strip(), []).append(track_id)
+        if not terms:
+            return previews
 
-        return self._format_search_items(items_raw, query_type)
+        if self._itunes_session is None:
+            self._itunes_session = create_requests_session()
 
-    def _format_search_items(self, items_raw, query_type):
-        """Helper to format raw Qobuz API JSON into a list of SearchResult objects."""
+        def _fetch_itunes_preview(search_term):
+            try:
+                res = self._itunes_session.get('https://itunes.apple.com/search', timeout=deadline.timeout(2),
+                    params={'term': search_term, 'media': 'music', 'entity': 'song', 'limit': 1}).json()
+            except Exception:
+                return search_term, None  # Not an answer: not cached
+            results = res.get('results') or []
+            return search_term, (results[0].get('previewUrl') or '') if results else ''
+
+        for result in deadline.map(self._task('itunes_preview', _fetch_itunes_preview), list(terms), max_workers=10):
+            if not result or result[1] is None:
+                continue
+            search_term, preview_url = result
+            for track_id in terms[search_term]:
+                if preview_url:
+                    previews[track_id] = preview_url
+                if self.preview_cache:
+                    self.preview_cache.set(track_id, preview_url, ttl=None if preview_url else self.PREVIEW_MISS_TTL)
+        return previews
+
+    def _format_search_items(self, items_raw, query_type, deadline=None, backfill=True, previews=True):
+        """Helper to format raw Qobuz API JSON into a list of SearchResult objects.
+        Metadata backfills and preview lookups that don't finish before the deadline are left out;
+        backfill=False/previews=False skip them altogether (offline index results)."""
+        deadline = deadline or Deadline()
         # Batch fetch missing album metadata (tracks_count) using ThreadPoolExecutor
-        if query_type is DownloadTypeEnum.album:
+        if query_type is DownloadTypeEnum.album and backfill:
             missing_metadata = [idx for idx, i in enumerate(items_raw) if not i.get('tracks_count')]
             if missing_metadata:
                 a_meta = {}
                 def _fetch_qobuz_album_meta(aid):
-                    try: return aid, self.session.get_album(aid)
+                    try: return aid, self.session.get_album(aid, timeout=deadline.timeout(15), priority=Priority.INTERACTIVE)
                     except: return aid, None
 
-                import concurrent.futures
-                with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-                    fetch_ids = [items_raw[idx]['id'] for idx in missing_metadata]
-                    for aid, full_data in executor.map(_fetch_qobuz_album_meta, fetch_ids):
-                        if full_data: a_meta[str(aid)] = full_data
-                
+                fetch_ids = [items_raw[idx]['id'] for idx in missing_metadata]
+                for result in deadline.map(self._task('album_backfill', _fetch_qobuz_album_meta), fetch_ids, max_workers=5):
+                    if result and result[1]: a_meta[str(result[0])] = result[1]
+
                 for idx in missing_metadata:
                     aid = str(items_raw[idx]['id'])
                     if aid in a_meta: items_raw[idx].update(a_meta[aid])
 
         # Pre-fetch preview URLs natively where possible
         preview_map = {}
-        if query_type is DownloadTypeEnum.track:
+        if query_type is DownloadTypeEnum.track and previews and not deadline.expired():
             # Parallel native preview fetch for all results (including guests)
             def _fetch_native_preview(i):
                 try:
-                    p_url = self.session.get_sample_url(str(i['id']))
+                    p_url = self.session.get_sample_url(str(i['id']), timeout=deadline.timeout(15), priority=Priority.INTERACTIVE)
                     if p_url and isinstance(p_url, str) and p_url.startswith('http'):
                         return str(i['id']), p_url
                 except: pass
                 return str(i['id']), None
 
-            import concurrent.futures
-            with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-                for iid, p_url in executor.map(_fetch_native_preview, items_raw):
-                    if p_url: preview_map[iid] = p_url
+            for result in deadline.map(self._task('native_preview', _fetch_native_preview), items_raw, max_workers=10):
+                if result and result[1]: preview_map[result[0]] = result[1]
 
             # Second-tier iTunes fallback ONLY for remaining tracks without native preview
             missing_idx = [idx for idx, i in enumerate(items_raw) if not preview_map.get(str(i['id']))]
-            if missing_idx:
-                def _fetch_itunes_preview(idx):
-                    i = items_raw[idx]
-                    try:
-                        import requests
-                        from urllib.parse import quote_plus
-                        artist = i.get('performer', {}).get('name') or i.get('album', {}).get('artist', {}).get('name', '')
-                        search_term = f"{artist} {i.get('title', '')}".strip()
-                        itunes_url = f"https://itunes.apple.com/search?term={quote_plus(search_term)}&media=music&entity=song&limit=1"
-                        res = requests.get(itunes_url, timeout=2).json()
-                        if res.get('results') and res['results'][0].get('previewUrl'):
-                            return str(i['id']), res['results'][0]['previewUrl']
-                    except: pass
-                    return str(i['id']), None
-                
-                with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-                    for iid, p_url in executor.map(_fetch_itunes_preview, missing_idx):
-                        if p_url: preview_map[iid] = p_url
+            if missing_idx and not deadline.expired():
+                preview_map.update(self._itunes_previews([items_raw[idx] for idx in missing_idx], deadline))
 
         items = []
         for i in items_raw:
@@ -1082,12 +1863,61 @@ class ModuleInterface:
             return []
 
 
+    PRELOADED_STATE_MARKER = '__PRELOADED_STATE__'
+
+    @classmethod
+    def _extract_preloaded_state(cls, resp):
+        """Stream the page and decode window.__PRELOADED_STATE__ with a single raw_decode.
+
+        Only a short tail is kept until the marker shows up, and reading stops at the first
+        </script> after it that completes the JSON value, so the rest of the page is never downloaded."""
+        import json
+
+        marker = cls.PRELOADED_STATE_MARKER
+        decoder = json.JSONDecoder()
+        assignment = re.compile(r'\s*=?\s*')
+        buffer, start, search_from = '', -1, 0
+        resp.encoding = resp.encoding or 'utf-8'
+        for chunk in resp.iter_content(chunk_size=64 * 1024, decode_unicode=True):
+            buffer += chunk
+            while start < 0:
+                idx = buffer.find(marker)
+                if idx < 0:
+                    buffer = buffer[-len(marker):]
+                    break
+                match = assignment.match(buffer, idx + len(marker))
+                if match.end() >= len(buffer):
+                    # Wait for the next chunk to see what follows the marker
+                    buffer = buffer[idx:]
+                    break
+                if '=' not in match.group():
+                    # A mention of the marker that isn't the assignment
+                    buffer = buffer[idx + len(marker):]
+                    continue
+                buffer, start = buffer[match.end():], 0
+            if start < 0:
+                continue
+            # Decode once the value's script has been closed (and again only if that </script> was inside it)
+            end = buffer.find('</script>', search_from)
+            if end < 0:
+                search_from = max(0, len(buffer) - len('</script>'))
+                continue
+            try:
+                state, _ = decoder.raw_decode(buffer, start)
+                return state
+            except ValueError:
+                search_from = end + len('</script>')
+        if start >= 0:
+            try:
+                return decoder.raw_decode(buffer, start)[0]
+            except ValueError:
+                pass
+        return None
+
     def _search_scraper(self, query_type: DownloadTypeEnum, query: str, limit: int):
         """Perform a search on the Qobuz website and extract results from the preloaded state."""
         try:
-            import json
-            import re
-            import requests
+            from urllib.parse import quote_plus
             
             # Map DownloadTypeEnum to Qobuz web search types
             type_map = {
@@ -1097,6 +1927,12 @@ class ModuleInterface:
                 DownloadTypeEnum.playlist: 'playlists'
             }
             q_type = type_map.get(query_type, 'tracks')
+
+            # Parsed results are reused per query; the formatting below is cheap in comparison
+            cache_key = (query, q_type)
+            items_raw = self._scraper_cache.get(cache_key)
+            if items_raw is not None:
+                return self._format_search_items(items_raw[:limit], query_type)
             
             # Use a realistic User-Agent to avoid being blocked
             headers = {
@@ -1106,49 +1942,20 @@ class ModuleInterface:
             }
             
             # We use a specific region (gb-en) to ensure English results
-            # Adding a trailing slash sometimes avoids an extra 301/302 redirect
-            url = f"https://www.qobuz.com/gb-en/search?q={query}&type={q_type}"
+            url = f"https://www.qobuz.com/gb-en/search?q={quote_plus(query)}&type={q_type}"
             logging.debug(f"Qobuz Scraper: Scraping {url}...")
             
-            # Use a fresh requests session to avoid any sticky 401/400 headers from the main session
-            resp = requests.get(url, headers=headers, timeout=10, allow_redirects=True)
-            resp.raise_for_status()
-            
-            # Extract the preloaded state JSON blob.
-            # Qobuz puts its data in window.__PRELOADED_STATE__
-            json_blob = None
-            
-            # Pattern 1: Look for the variable assignment in the HTML
-            # We look for window.__PRELOADED_STATE__ = { ... }
-            match = re.search(r'__PRELOADED_STATE__\s*=\s*(\{.*?\})\s*;\s*', resp.text, re.DOTALL)
-            if not match:
-                # Pattern 2: Greedily capture from assignment until a potential end of script or next statement
-                match = re.search(r'__PRELOADED_STATE__\s*=\s*(\{.*?\})\s*(?:window\.|</script>|;|$)', resp.text, re.DOTALL)
-            
-            if match:
-                json_blob = match.group(1).strip()
-            
-            if not json_blob:
+            # Pooled session of its own, to avoid any sticky 401/400 headers from the main session
+            if self._scraper_session is None:
+                self._scraper_session = create_requests_session()
+            with self._scraper_session.get(url, headers=headers, timeout=10, allow_redirects=True, stream=True) as resp:
+                resp.raise_for_status()
+                # Qobuz puts its data in window.__PRELOADED_STATE__ = { ... }
+                state = self._extract_preloaded_state(resp)
+
+            if not isinstance(state, dict):
                 logging.debug("Qobuz Scraper: No JSON result blob found in HTML.")
                 return []
-                
-            try:
-                state = json.loads(json_blob)
-            except Exception as je:
-                logging.debug(f"Qobuz Scraper: JSON parse error: {je}")
-                # Try to clean up the blob (sometimes it has extra trailing data)
-                try:
-                    # Very basic "find the matching closing brace" logic
-                    brace_count = 0
-                    for i, char in enumerate(json_blob):
-                        if char == '{': brace_count += 1
-                        elif char == '}': brace_count -= 1
-                        if brace_count == 0:
-                            state = json.loads(json_blob[:i+1])
-                            break
-                    else: raise Exception("Incomplete JSON")
-                except:
-                    return []
             
             # Navigate the state object to find results
             items_raw = []
@@ -1192,6 +1999,7 @@ class ModuleInterface:
                     seen.add(iid)
                     unique.append(it)
             
+            self._scraper_cache.set(cache_key, unique)
             return self._format_search_items(unique[:limit], query_type)
             
         except Exception as e:
@@ -0,0 +1,149 @@
+import os
+import re
+import sqlite3
+import logging
+import threading
+
+
+class LibraryIndex:
+    """SQLite index of already archived Qobuz tracks (track id and/or ISRC, with the archived quality).
+
+    Album/playlist expansion consults it to drop tracks that are already archived at the same or
+    better quality, before any per-track API call. Populated by finished downloads and by rebuild(),
+    which scans the tags of an existing library. There is one row per Qobuz track id (per file path
+    for files without one), updated in place when the track is downloaded or scanned again.
+
+    Standalone rebuild, from the OrpheusDL root folder:
+        python modules/qobuz/library_index.py /path/to/index.db /path/to/library
+    """
+
+    AUDIO_EXTENSIONS = ('.flac', '.mp3', '.m4a', '.ogg', '.opus')
+    _QOBUZ_TRACK_URL = re.compile(r'qobuz\.com/(?:[a-z]{2}-[a-z]{2}/)?track/(\d+)')
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript('''
+            CREATE TABLE IF NOT EXISTS tracks (
+                track_id TEXT,
+                isrc TEXT,
+                bit_depth INTEGER NOT NULL DEFAULT 0,
+                sample_rate REAL NOT NULL DEFAULT 0,
+                path TEXT
+            );
+            CREATE INDEX IF NOT EXISTS tracks_isrc ON tracks (isrc);
+        ''')
+        unique = self._db.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'tracks_path'").fetchone()
+        if not unique:
+            # Indexes written before rows were updated in place hold one row per download: keep the latest
+            with self._db:
+                self._db.executescript('''
+                    DELETE FROM tracks WHERE track_id IS NOT NULL AND rowid NOT IN
+                        (SELECT MAX(rowid) FROM tracks WHERE track_id IS NOT NULL GROUP BY track_id);
+                    DELETE FROM tracks WHERE path IS NOT NULL AND rowid NOT IN
+                        (SELECT MAX(rowid) FROM tracks WHERE path IS NOT NULL GROUP BY path);
+                    DROP INDEX IF EXISTS tracks_track_id;
+                    CREATE UNIQUE INDEX tracks_track_id ON tracks (track_id) WHERE track_id IS NOT NULL;
+                    CREATE UNIQUE INDEX tracks_path ON tracks (path) WHERE path IS NOT NULL;
+                ''')
+
+    def add(self, track_id=None, isrc=None, bit_depth=0, sample_rate=0, path=None):
+        if not track_id and not isrc:
+            return
+        with self._lock, self._db:
+            self._upsert(str(track_id) if track_id else None, isrc or None, bit_depth or 0, sample_rate or 0, path)
+
+    def _upsert(self, track_id, isrc, bit_depth, sample_rate, path):
+        """Insert or update the row of track_id (or of path, or of a bare isrc); called with the lock held, in a transaction."""
+        by_path = self._db.execute('SELECT rowid FROM tracks WHERE path = ?', (path,)).fetchone() if path else None
+        if track_id:
+            row = self._db.execute('SELECT rowid, bit_depth, sample_rate FROM tracks WHERE track_id = ?', (track_id,)).fetchone()
+        elif path:
+            row = by_path
+        else:
+            row = self._db.execute('SELECT rowid FROM tracks WHERE isrc = ? AND track_id IS NULL AND path IS NULL', (isrc,)).fetchone()
+        if not row:
+            if by_path:
+                self._db.execute('DELETE FROM tracks WHERE rowid = ?', (by_path[0],))  # that file now holds this track
+            self._db.execute('INSERT INTO tracks (track_id, isrc, bit_depth, sample_rate, path) VALUES (?, ?, ?, ?, ?)',
+                             (track_id, isrc, bit_depth, sample_rate, path))
+            return
+        if track_id and not by_path and (bit_depth < row[1] or sample_rate < row[2]):
+            # A lower quality copy elsewhere doesn't replace the better one already archived
+            self._db.execute('UPDATE tracks SET isrc = COALESCE(?, isrc) WHERE rowid = ?', (isrc, row[0]))
+            return
+        if by_path and by_path[0] != row[0]:
+            self._db.execute('DELETE FROM tracks WHERE rowid = ?', (by_path[0],))
+        self._db.execute('UPDATE tracks SET isrc = COALESCE(?, isrc), bit_depth = ?, sample_rate = ?, path = COALESCE(?, path) '
+                         'WHERE rowid = ?', (isrc, bit_depth, sample_rate, path, row[0]))
+
+    def has(self, track_id=None, isrc=None, bit_depth=0, sample_rate=0) -> bool:
+        """True if the track (by Qobuz id or ISRC) is archived at bit_depth/sample_rate or better."""
+        with self._lock:
+            row = self._db.execute(
+                'SELECT 1 FROM tracks WHERE (track_id = ? OR isrc = ?) AND bit_depth >= ? AND sample_rate >= ? LIMIT 1',
+                (str(track_id) if track_id else None, isrc or None, bit_depth or 0, sample_rate or 0)).fetchone()
+        return row is not None
+
+    def rebuild(self, library_root: str, clear: bool = True) -> int:
+        """Re-populate the index from the tags of every audio file below library_root. Returns the number of files indexed."""
+        import mutagen
+
+        rows = []
+        for folder, _, files in os.walk(library_root):
+            for name in files:
+                if not name.lower().endswith(self.AUDIO_EXTENSIONS):
+                    continue
+                path = os.path.join(folder, name)
+                try:
+                    audio = mutagen.File(path)
+                except Exception as e:
+                    logging.debug(f"Qobuz library index: skipping {path}: {e}")
+                    continue
+                if audio is None:
+                    continue
+                track_id, isrc = self._read_ids(audio)
+                if not track_id and not isrc:
+                    continue
+                bit_depth = getattr(audio.info, 'bits_per_sample', 0) or 0
+                sample_rate = (getattr(audio.info, 'sample_rate', 0) or 0) / 1000
+                if name.lower().endswith(('.mp3', '.ogg', '.opus')):
+                    bit_depth, sample_rate = 0, 0  # lossy: only satisfies lossy requests
+                rows.append((track_id, isrc, bit_depth, sample_rate, path))
+
+        with self._lock, self._db:
+            if clear:
+                self._db.execute('DELETE FROM tracks')
+            for row in rows:
+                self._upsert(*row)
+        return len(rows)
+
+    @classmethod
+    def _read_ids(cls, audio):
+        """(Qobuz track id, ISRC) from the tags of a mutagen file, in any of the FLAC/ID3/MP4 layouts."""
+        track_id, isrc = None, None
+        for key, value in (audio.tags.items() if audio.tags else []):
+            values = value if isinstance(value, list) else getattr(value, 'text', None) or [getattr(value, 'url', value)]
+            text = ' '.join(v.decode('utf-8', 'ignore') if isinstance(v, bytes) else str(v) for v in values)
+            key_upper = str(key).upper()
+            if not isrc and (key_upper in ('ISRC', 'TSRC') or key_upper.endswith(':ISRC')):
+                isrc = text.strip() or None
+            if not track_id:
+                match = cls._QOBUZ_TRACK_URL.search(text)
+                if match:
+                    track_id = match.group(1)
+        return track_id, isrc
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Rebuild the Qobuz library index from the tags of an existing library.')
+    parser.add_argument('index', help='path of the SQLite index (the "library_index" setting)')
+    parser.add_argument('library', help='root folder of the archived library')
+    parser.add_argument('--append', action='store_true', help='keep existing entries instead of replacing them')
+    args = parser.parse_args()
+
+    count = LibraryIndex(args.index).rebuild(args.library, clear=not args.append)
+    print(f'Indexed {count} tracks from {args.library}')
@@ -0,0 +1,85 @@
+import time
+import logging
+import threading
+from urllib.parse import urlparse, parse_qs
+
+
+class StreamPrefetcher:
+    """Resolves stream URLs for the next tracks of an album/playlist in the background.
+
+    get_album_info/get_playlist_info register the track order with set_queue(); every time the
+    core asks for a track through get(), the following `lookahead` tracks are resolved on a small
+    worker pool so their getFileUrl round-trips overlap with the current download.
+    """
+
+    # Re-resolve instead of handing out URLs this close to their expiry
+    EXPIRY_MARGIN = 60
+    # Stream URLs without an etsp (expiry) parameter are considered valid for this long
+    DEFAULT_TTL = 120
+
+    def __init__(self, resolve, lookahead: int = 3, max_workers: int = 2):
+        import concurrent.futures
+
+        self._resolve = resolve
+        self.lookahead = lookahead
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=max(1, min(max_workers, lookahead)), thread_name_prefix='qobuz-prefetch')
+        self._lock = threading.Lock()
+        self._order = []
+        self._position = {}
+        self._quality_id = None
+        self._pending = {}  # (track_id, quality_id) -> Future of (stream_data, expires_at)
+
+    def set_queue(self, track_ids, quality_id):
+        with self._lock:
+            self._order = [str(t) for t in track_ids]
+            self._position = {t: i for i, t in enumerate(self._order)}
+            self._quality_id = quality_id
+            for key in [k for k in self._pending if k[0] not in self._position or k[1] != quality_id]:
+                self._pending.pop(key).cancel()
+            self._schedule(0, self.lookahead)
+
+    def get(self, track_id, quality_id):
+        """Return prefetched stream data for track_id if available and fresh, else None."""
+        track_id = str(track_id)
+        with self._lock:
+            future = self._pending.pop((track_id, quality_id), None)
+            position = self._position.get(track_id)
+            if position is not None and quality_id == self._quality_id:
+                self._schedule(position + 1, self.lookahead)
+
+        if not future or future.cancelled():
+            return None
+        try:
+            stream_data, expires_at = future.result()
+        except Exception as e:
+            logging.debug(f"Qobuz prefetch: {track_id} failed in background, resolving again: {e}")
+            return None
+        if expires_at - time.time() < self.EXPIRY_MARGIN:
+            return None
+        return stream_data
+
+    def shutdown(self):
+        with self._lock:
+            for future in self._pending.values():
+                future.cancel()
+            self._pending.clear()
+        self._executor.shutdown(wait=False)
+
+    def _schedule(self, start, count):
+        # Called with self._lock held
+        for track_id in self._order[start:start + count]:
+            key = (track_id, self._quality_id)
+            if key not in self._pending:
+                self._pending[key] = self._executor.submit(self._fetch, track_id, self._quality_id)
+
+    def _fetch(self, track_id, quality_id):
+        stream_data = self._resolve(track_id, quality_id)
+        return stream_data, self._expiry(stream_data.get('url'))
+
+    @classmethod
+    def _expiry(cls, url):
+        if url:
+            etsp = parse_qs(urlparse(url).query).get('etsp')
+            if etsp and etsp[0].isdigit():
+                return int(etsp[0])
+        return time.time() + cls.DEFAULT_TTL
@@ -0,0 +1,121 @@
+import os
+import sys
+import time
+import threading
+import itertools
+import logging
+from collections import Counter
+from functools import wraps
+
+
+class Profiler:
+    """Opt-in profiler for module entry points and executor tasks.
+
+    Every outermost call made through a wrapped function is a "job": it is run
+    under cProfile and, in parallel, a sampling thread records the job thread's
+    stack. On exit two files are written to output_dir:
+      - {job}.prof    pstats dump (snakeviz, python -m pstats, ...)
+      - {job}.folded  collapsed stacks, one "frame;frame;frame count" per line,
+                      directly usable by flamegraph.pl / speedscope / inferno
+    """
+
+    def __init__(self, output_dir: str, sample_interval: float = 0.005):
+        self.output_dir = output_dir
+        self.sample_interval = sample_interval
+        os.makedirs(output_dir, exist_ok=True)
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._seq = itertools.count(1)
+        self._active = {}  # thread id -> Counter of collapsed stacks
+        self._sampler = None
+
+    def wrap(self, name: str, func):
+        """Return func wrapped so that outermost calls are profiled as a job called name."""
+        @wraps(func)
+        def _profiled(*args, **kwargs):
+            # Nested calls (e.g. get_track_info from inside a profiled job) are part of the parent job;
+            # cProfile can't be enabled twice on the same thread anyway.
+            if getattr(self._local, 'depth', 0):
+                self._local.depth += 1
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self._local.depth -= 1
+            return self._run_job(name, func, args, kwargs)
+        return _profiled
+
+    def _run_job(self, name, func, args, kwargs):
+        import cProfile
+
+        thread_id = threading.get_ident()
+        stacks = Counter()
+        with self._lock:
+            self._active[thread_id] = stacks
+            self._ensure_sampler()
+
+        profile = cProfile.Profile()
+        self._local.depth = 1
+        started = time.perf_counter()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler (debugger, coverage, ...) owns this thread; sampling still works
+            profile = None
+        try:
+            return func(*args, **kwargs)
+        finally:
+            if profile:
+                profile.disable()
+            elapsed = time.perf_counter() - started
+            self._local.depth = 0
+            with self._lock:
+                self._active.pop(thread_id, None)
+            self._dump(name, profile, stacks, elapsed)
+
+    def _ensure_sampler(self):
+        # Called with self._lock held
+        if self._sampler and self._sampler.is_alive():
+            return
+        self._sampler = threading.Thread(target=self._sample_loop, name='qobuz-profiler', daemon=True)
+        self._sampler.start()
+
+    def _sample_loop(self):
+        own_id = threading.get_ident()
+        while True:
+            with self._lock:
+                if not self._active:
+                    self._sampler = None
+                    return
+                targets = dict(self._active)
+            frames = sys._current_frames()
+            for thread_id, stacks in targets.items():
+                frame = frames.get(thread_id)
+                if frame is None or thread_id == own_id:
+                    continue
+                stacks[self._collapse(frame)] += 1
+            del frames
+            time.sleep(self.sample_interval)
+
+    @staticmethod
+    def _collapse(frame):
+        parts = []
+        while frame is not None:
+            code = frame.f_code
+            parts.append(f"{os.path.basename(code.co_filename)}:{code.co_name}:{code.co_firstlineno}")
+            frame = frame.f_back
+        return ';'.join(reversed(parts))
+
+    def _dump(self, name, profile, stacks, elapsed):
+        job = f"{time.strftime('%Y%m%d-%H%M%S')}_{next(self._seq):05d}_{name}"
+        base = os.path.join(self.output_dir, job)
+        try:
+            if profile:
+                profile.dump_stats(base + '.prof')
+            if stacks:
+                with open(base + '.folded', 'w', encoding='utf-8') as f:
+                    for stack, count in stacks.most_common():
+                        f.write(f"{stack} {count}\n")
+            logging.debug(f"Qobuz profiler: {name} took {elapsed:.3f}s, written to {base}.*")
+        except OSError as e:
+            logging.debug(f"Qobuz profiler: could not write {base}: {e}")
@@ -3,8 +3,47 @@ import time
 import re
 import base64
 from collections import OrderedDict
+from contextlib import nullcontext
 
 from utils.utils import create_requests_session
+from .scheduler import Priority
+
+
+# JSON decoders for API responses, fastest first: backend name -> module providing loads().
+# orjson/ujson are optional and used when installed; none is imported before the first decode.
+JSON_BACKENDS = {'orjson': 'orjson', 'ujson': 'ujson', 'json': 'json'}
+
+
+def installed_json_backends():
+    """Names of the JSON backends that are installed, fastest first (found without importing them)."""
+    from importlib.util import find_spec
+
+    return [name for name, module in JSON_BACKENDS.items() if module == 'json' or find_spec(module) is not None]
+
+
+class _LazyLoads:
+    """loads() of a JSON backend, imported on the first decode so importing the module doesn't pay for it."""
+
+    def __init__(self, module):
+        self.module = module
+        self._loads = None
+
+    def __call__(self, data):
+        if self._loads is None:
+            import importlib
+
+            self._loads = importlib.import_module(self.module).loads
+        return self._loads(data)
+
+
+def get_json_decoder(name: str = 'auto'):
+    """Return the loads() function of the named backend, or the fastest installed one for 'auto'."""
+    installed = installed_json_backends()
+    if not name or name == 'auto':
+        return _LazyLoads(JSON_BACKENDS[installed[0]])
+    if name not in installed:
+        raise ValueError(f'JSON backend "{name}" is not installed, available: {", ".join(installed)}')
+    return _LazyLoads(JSON_BACKENDS[name])
 
 
 class Qobuz:
@@ -18,6 +57,16 @@ class Qobuz:
         self._auth_token = None
         self.exception = exception
         self._bundle_info = None
+        # Last validate_token() outcome: (token, valid, time checked), reused for token_ttl seconds.
+        # valid is None after a 401 from some other call: unknown until user/get confirms it
+        self.token_ttl = 600
+        self._token_status = None
+        # Decoder for API response bodies (bytes in, objects out), see get_json_decoder
+        self.json_loads = get_json_decoder()
+        # Optional PriorityGate limiting concurrent requests; without one every request goes out immediately
+        self.gate = None
+        # Optional Hedger duplicating GET requests that are slower than their endpoint's usual p95
+        self.hedger = None
 
         # Create session with persistent headers — exactly like qobuz-dl
         self.s = create_requests_session()
@@ -56,22 +105,38 @@ class Qobuz:
             self.s.headers.pop('X-User-Auth-Token', None)
 
 
-    def validate_token(self):
-        """Check if current auth_token is valid by making a lightweight authenticated call."""
-        if not self.auth_token:
+    def token_known_valid(self) -> bool:
+        """True if a cached validation result younger than token_ttl says the current token is valid.
+        A token rejected by validate_token(), or suspect after a 401, is never "known valid", however recent the result."""
+        status = self._token_status
+        return bool(status) and status[0] == self.auth_token and status[1] is True \
+            and time.monotonic() - status[2] < self.token_ttl
+
+    def validate_token(self, max_age=None):
+        """Check if current auth_token is valid by making a lightweight authenticated call.
+        The result is cached per token for max_age seconds (token_ttl by default). A token made suspect by a
+        401 elsewhere is always re-checked: only user/get rejecting it returns False."""
+        token = self.auth_token
+        if not token:
             return False
+        status = self._token_status
+        max_age = self.token_ttl if max_age is None else max_age
+        if status and status[0] == token and status[1] is not None and time.monotonic() - status[2] < max_age:
+            return status[1]
         try:
             # user/get is the standard way to verify a session/retrieve user info
             self.api_call('user/get', signed=True)
-            return True
+            valid = True
         except Exception as e:
-            # Only invalidate if it's explicitly an authentication error (401/400 with "User authentication is required")
+            # Only invalidate if user/get explicitly rejects the token (401 "User authentication is required")
             err_msg = str(e).lower()
-            is_auth_error = '"code":401' in err_msg or "authentication" in err_msg or "invalid" in err_msg
-            if is_auth_error:
-                return False
-            # For other errors (network timeout, etc.), assume the token might still be valid to avoid clearing it
-            return True
+            is_auth_error = '"code":401' in err_msg or "authentication is required" in err_msg
+            if not is_auth_error:
+                # For other errors (network timeout, etc.), assume the token might still be valid to avoid clearing it
+                return True
+            valid = False
+        self._token_status = (token, valid, time.monotonic())
+        return valid
 
     def get_bundle_info(self):
         """Scrapes app_id, secrets, and private_key from the Qobuz web player."""
@@ -180,12 +245,12 @@ class Qobuz:
             
         return r.json()
 
-    def _get_request_sig(self, epoint, params):
+    def _get_request_sig(self, epoint, params, guest=False):
         """Web player signature pattern: {object}{method}{sorted_params}{timestamp}{secret}"""
         unix = str(int(time.time()))
         
         # Determine which secret to use
-        secret = self.guest_app_secret if not self.auth_token else "abb21364945c0583309667d13ca3d93a"
+        secret = self.guest_app_secret if guest or not self.auth_token else "abb21364945c0583309667d13ca3d93a"
         
         # Pattern for signature: alphabetically sorted key-values, then timestamp, then secret
         sig_base = epoint.replace('/', '')
@@ -199,32 +264,48 @@ class Qobuz:
         
         return unix, hashlib.md5(sig_base.encode('utf-8')).hexdigest()
 
-    def api_call(self, epoint, params=None, post=False, signed=False):
-        """Generic API call matching the working qobuz-dl pattern."""
+    def api_call(self, epoint, params=None, post=False, signed=False, headers=None, guest=False, timeout=15,
+                 priority=Priority.DOWNLOAD):
+        """Generic API call matching the working qobuz-dl pattern.
+        headers are sent with this request only, so concurrent calls never see each other's overrides.
+        guest=True makes this one call as the public web player (guest app id/secret, no user token).
+        priority decides the order in which requests waiting for the gate are sent."""
         if params is None:
             params = {}
-            
+
+        if guest:
+            # None removes the session's auth header from this request only
+            headers = {**(headers or {}), 'X-App-Id': self.guest_app_id, 'X-User-Auth-Token': None}
+
         # Select correct App ID based on session state: Guest ID for guests, Production ID for logged-in users
         # This ensures signatures match the App ID being used.
-        if not self.auth_token:
+        if guest or not self.auth_token:
             params['app_id'] = self.guest_app_id
         elif 'app_id' not in params:
             params['app_id'] = self.app_id
 
         if signed:
-            unix, sig = self._get_request_sig(epoint, params)
+            unix, sig = self._get_request_sig(epoint, params, guest=guest)
             params['request_ts'] = unix
             params['request_sig'] = sig
 
-        if post:
-            r = self.s.post(self.api_base + epoint, data=params, timeout=15)
-        else:
-            r = self.s.get(self.api_base + epoint, params=params, timeout=15)
+        def _send():
+            with self.gate.slot(priority) if self.gate else nullcontext():
+                if post:
+                    return self.s.post(self.api_base + epoint, data=params, headers=headers, timeout=timeout)
+                return self.s.get(self.api_base + epoint, params=params, headers=headers, timeout=timeout)
+
+        # Only GETs are hedged: every API GET is a read, so sending it twice is harmless
+        r = self.hedger.run(epoint, _send) if self.hedger and not post else _send()
 
         if r.status_code not in [200, 201, 202]:
+            if r.status_code == 401 and not guest and self.auth_token:
+                # Not proof the token is bad (getFileUrl format 5 and restricted endpoints answer 401 to valid
+                # tokens too): mark it suspect so the next credentials check re-confirms it with user/get
+                self._token_status = (self.auth_token, None, time.monotonic())
             raise self.exception(r.text)
 
-        return r.json()
+        return self.json_loads(r.content)
 
     def login(self, email: str, password: str):
         # If the password looks like a token (very long), use it directly
@@ -269,16 +350,17 @@ class Qobuz:
         self.s.headers.update({'X-User-Auth-Token': self.auth_token})
         return self.auth_token
 
-    def search(self, query_type: str, query: str, limit: int = 10):
+    def search(self, query_type: str, query: str, limit: int = 10, guest: bool = False, timeout=15,
+               priority=Priority.INTERACTIVE):
         # Standard call pattern from qobuz-dl: include app_id in params
         params = {
             'query': query,
             'type': query_type + 's',
             'limit': str(limit),
         }
-        return self.api_call('catalog/search', params, signed=True)
+        return self.api_call('catalog/search', params, signed=True, guest=guest, timeout=timeout, priority=priority)
 
-    def get_file_url(self, track_id: str, quality_id=27):
+    def get_file_url(self, track_id: str, quality_id=27, headers=None, timeout=15, priority=Priority.DOWNLOAD):
         # Always use guest ID for quality_id=5 (previews) if not logged in
         is_guest_preview = not self.auth_token and str(quality_id) == '5'
         
@@ -288,43 +370,25 @@ class Qobuz:
             'intent': 'stream'
         }
         
-        # Determine App ID
+        # Determine App ID, sent as a per-request header override so parallel calls (prefetch, previews) don't race
         target_app_id = self.guest_app_id if is_guest_preview else self.app_id
 
-        # Update session header with the target app_id for this call
-        orig_app_id_header = self.s.headers.get('X-App-Id')
-        self.s.headers.update({'X-App-Id': target_app_id})
+        # Generate signature (exclude app_id since it's now a header)
+        unix, sig = self._get_request_sig('track/getFileUrl', params)
 
-        try:
-            # Generate signature (exclude app_id since it's now a header)
-            unix, sig = self._get_request_sig('track/getFileUrl', params)
-            
-            # Parameters for the API call
-            params['request_ts'] = unix
-            params['request_sig'] = sig
+        # Parameters for the API call
+        params['request_ts'] = unix
+        params['request_sig'] = sig
 
-            # Make the call
-            return self.api_call('track/getFileUrl', params)
-        finally:
-            # Restore original header
-            if orig_app_id_header: self.s.headers.update({'X-App-Id': orig_app_id_header})
-            else: self.s.headers.pop('X-App-Id', None)
+        return self.api_call('track/getFileUrl', params, headers={**(headers or {}), 'X-App-Id': target_app_id},
+                             timeout=timeout, priority=priority)
 
-    def get_sample_url(self, track_id: str):
+    def get_sample_url(self, track_id: str, timeout=15, priority=Priority.DOWNLOAD):
         """Get the sample/preview URL for a track."""
         try:
             # Set Referer for guest previews to bypass blocks
-            orig_referer = self.s.headers.get('Referer')
-            if not self.auth_token:
-                self.s.headers.update({'Referer': 'https://open.qobuz.com/'})
-            
-            result = self.get_file_url(track_id, 5)
-            
-            # Clean up header
-            if not self.auth_token:
-                if orig_referer: self.s.headers.update({'Referer': orig_referer})
-                else: self.s.headers.pop('Referer', None)
-                
+            headers = {'Referer': 'https://open.qobuz.com/'} if not self.auth_token else None
+            result = self.get_file_url(track_id, 5, headers=headers, timeout=timeout, priority=priority)
             return result.get('url')
         except Exception:
             return None
@@ -344,26 +408,27 @@ class Qobuz:
         except Exception:
             return None
 
-    def get_playlist(self, playlist_id: str, limit: int = 500, offset: int = 0):
+    def get_playlist(self, playlist_id: str, limit: int = 500, offset: int = 0, extra: str = 'tracks,subscribers,focusAll'):
         return self.api_call('playlist/get', params={
             'playlist_id': playlist_id,
             'limit': str(limit),
             'offset': str(offset),
-            'extra': 'tracks,subscribers,focusAll',
+            'extra': extra,
         }, signed=True)
 
-    def get_album(self, album_id: str):
+    def get_album(self, album_id: str, timeout=15, priority=Priority.DOWNLOAD):
         return self.api_call('album/get', params={
             'album_id': album_id,
             'extra': 'albumsFromSameArtist,focusAll',
-        }, signed=True)
+        }, signed=True, timeout=timeout, priority=priority)
 
-    def get_artist(self, artist_id: str):
+    def get_artist(self, artist_id: str, limit: int = 1000, offset: int = 0,
+                   extra: str = 'albums,playlists,tracks_appears_on,albums_with_last_release,focusAll'):
         return self.api_call('artist/get', params={
             'artist_id': artist_id,
-            'extra': 'albums,playlists,tracks_appears_on,albums_with_last_release,focusAll',
-            'limit': '1000',
-            'offset': '0',
+            'extra': extra,
+            'limit': str(limit),
+            'offset': str(offset),
         }, signed=True)
 
     def get_label(self, label_id: str, limit: int = 500, offset: int = 0):
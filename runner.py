@@ -0,0 +1,150 @@
+import time
+import logging
+
+from .qobuz_api import Qobuz
+from .storage import JsonStore
+
+
+# Per worker process state, set up by _init_worker
+_session = None
+_cache = None
+_cache_ttl = 0
+_next_slot = None
+_interval = 0
+
+
+def _init_worker(app_id, app_secret, auth_token, cache_dir, cache_ttl, next_slot, interval):
+    global _session, _cache, _cache_ttl, _next_slot, _interval
+    _session = Qobuz(app_id, app_secret, Exception)
+    _session.auth_token = auth_token
+    _cache = JsonStore(cache_dir)
+    _cache_ttl = cache_ttl
+    _next_slot = next_slot
+    _interval = interval
+
+
+def _throttle():
+    """Global rate limit shared by all workers: each request reserves the next free time slot."""
+    if not _interval:
+        return
+    with _next_slot.get_lock():
+        now = time.time()
+        slot = max(now, _next_slot.value)
+        _next_slot.value = slot + _interval
+    if slot > now:
+        time.sleep(slot - now)
+
+
+def _fetch_album_item(album_id):
+    return album_id, _fetch_album(album_id)
+
+
+def _fetch_album(album_id):
+    key = f'album_{album_id}'
+    cached = _cache.load(key)
+    if cached and time.time() - cached['fetched_at'] < _cache_ttl:
+        _cache.touch(key)
+        return cached['data']
+    _throttle()
+    try:
+        data = _session.get_album(str(album_id))
+    except Exception as e:
+        logging.debug(f"Qobuz runner: album {album_id} failed: {e}")
+        return None
+    _cache.save(key, {'fetched_at': time.time(), 'data': data})
+    return data
+
+
+class ShardedRunner:
+    """Spreads album/get calls for a large label or artist catalogue over worker processes.
+
+    Workers share an on-disk metadata cache (one JSON document per album, reused across runs for
+    cache_ttl seconds and capped at max_cache_entries, least recently used first out) and a global
+    request rate limit. iter_albums() hands each payload out as soon
+    as a worker has it, so only the payloads in flight are held in memory.
+
+    Standalone catalogue export, from the OrpheusDL root folder:
+        python -m modules.qobuz.runner label 123456 --output export --format parquet --processes 8 --token ...
+    """
+
+    def __init__(self, session: Qobuz, processes: int, cache_dir: str, requests_per_second: float = 10, cache_ttl: int = 86400,
+                 max_cache_entries: int = 5000):
+        self.session = session
+        self.processes = processes
+        self.cache_dir = cache_dir
+        self.requests_per_second = requests_per_second
+        self.cache_ttl = cache_ttl
+        self.max_cache_entries = max_cache_entries
+
+    def iter_albums(self, album_ids):
+        """(album id, album/get payload or None on failure) for every id, in completion order."""
+        import multiprocessing
+
+        # spawn everywhere: same behaviour on Windows/macOS/Linux and no forked locks from the parent's threads
+        context = multiprocessing.get_context('spawn')
+        next_slot = context.Value('d', 0.0)
+        interval = 1 / self.requests_per_second if self.requests_per_second else 0
+        initargs = (self.session.app_id, self.session.app_secret, self.session.auth_token,
+                    self.cache_dir, self.cache_ttl, next_slot, interval)
+        chunksize = max(1, len(album_ids) // (self.processes * 8))
+        try:
+            with context.Pool(self.processes, initializer=_init_worker, initargs=initargs) as pool:
+                yield from pool.imap_unordered(_fetch_album_item, album_ids, chunksize=chunksize)
+        finally:
+            pruned = JsonStore(self.cache_dir).prune(self.max_cache_entries, max_age=self.cache_ttl)
+            if pruned:
+                logging.debug(f"Qobuz runner: pruned {pruned} cached albums")
+
+
+def _listed_album_ids(session, kind, entity_id):
+    """Ids of every album of a label/artist, paging through its listing."""
+    album_ids, offset = [], 0
+    while True:
+        if kind == 'label':
+            page = session.get_label(entity_id, offset=offset).get('albums') or {}
+        else:
+            page = session.get_artist(entity_id, offset=offset, extra='albums').get('albums') or {}
+        items = page.get('items') or []
+        album_ids += [str(a['id']) for a in items if isinstance(a, dict)]
+        offset += len(items)
+        if not items or offset >= (page.get('total') or 0):
+            return album_ids
+
+
+if __name__ == '__main__':
+    import os
+    import json
+    import argparse
+    import tempfile
+
+    from .export import MetadataExporter
+    from .interface import _parse_credits, module_information
+
+    parser = argparse.ArgumentParser(description='Export the album and track metadata of Qobuz labels/artists, '
+                                                 'fetching the albums over a pool of worker processes.')
+    parser.add_argument('kind', choices=('label', 'artist'))
+    parser.add_argument('ids', nargs='+', help='label/artist ids')
+    parser.add_argument('--output', required=True, help='folder for albums.<format> and tracks.<format>')
+    parser.add_argument('--format', default='jsonl', choices=tuple(MetadataExporter.FORMATS))
+    parser.add_argument('--processes', type=int, default=4)
+    parser.add_argument('--rate', type=float, default=10, help='album requests per second over all workers, 0 for no limit')
+    parser.add_argument('--cache-dir', default=os.path.join(tempfile.gettempdir(), 'qobuz', 'album_cache'))
+    parser.add_argument('--app-id', default=module_information.global_settings['app_id'])
+    parser.add_argument('--app-secret', default=module_information.global_settings['app_secret'])
+    parser.add_argument('--token', default=os.environ.get('QOBUZ_TOKEN'), help='user auth token (default: $QOBUZ_TOKEN)')
+    args = parser.parse_args()
+
+    session = Qobuz(args.app_id, args.app_secret, Exception)
+    session.auth_token = args.token
+    runner = ShardedRunner(session, args.processes, args.cache_dir, requests_per_second=args.rate)
+    with MetadataExporter(args.output, args.format) as exporter:
+        for entity_id in args.ids:
+            album_ids = [a for a in _listed_album_ids(session, args.kind, entity_id) if not exporter.album_expanded(a)]
+            for album_id, album_data in runner.iter_albums(album_ids):
+                if not album_data:
+                    continue
+                tracks = (album_data.pop('tracks', None) or {}).get('items') or []
+                exporter.add_album(album_data)
+                for track in tracks:
+                    exporter.add_track(track, album_id, _parse_credits(track.get('performers')))
+        print(json.dumps(exporter.counts))
@@ -0,0 +1,48 @@
+import threading
+from enum import IntEnum
+from contextlib import contextmanager
+
+
+class Priority(IntEnum):
+    INTERACTIVE = 0  # GUI searches and anything a user is waiting on
+    DOWNLOAD = 1     # requests on the critical path of the current download
+    BACKGROUND = 2   # bulk expansion: album backfills, prefetching ahead
+
+
+class PriorityGate:
+    """Caps concurrent API requests and hands free slots to the most urgent waiting request.
+
+    A request waits while all slots are taken or while any request of a higher priority is waiting,
+    so queued bulk work yields to interactive calls. Background requests also leave one slot free
+    (with more than one slot), so an interactive call never queues behind a full backfill.
+    """
+
+    def __init__(self, max_concurrent: int):
+        self.max_concurrent = max_concurrent
+        self._active = 0
+        self._waiting = [0] * len(Priority)
+        self._cond = threading.Condition()
+
+    def _limit(self, priority):
+        if priority is Priority.BACKGROUND and self.max_concurrent > 1:
+            return self.max_concurrent - 1
+        return self.max_concurrent
+
+    @contextmanager
+    def slot(self, priority: Priority = Priority.DOWNLOAD):
+        with self._cond:
+            self._waiting[priority] += 1
+            try:
+                while self._active >= self._limit(priority) or any(self._waiting[:priority]):
+                    self._cond.wait()
+            finally:
+                self._waiting[priority] -= 1
+            self._active += 1
+            # Lower priority waiters may be unblocked now that this one stopped waiting
+            self._cond.notify_all()
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._active -= 1
+                self._cond.notify_all()
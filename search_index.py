@@ -0,0 +1,116 @@
+import os
+import re
+import json
+import time
+import sqlite3
+import threading
+
+
+# Sub-trees that are large and never needed to format a search result
+_HEAVY_KEYS = ('tracks', 'albums', 'playlists', 'tracks_appears_on', 'albums_without_last_release',
+               'albums_with_last_release', 'goodies', 'description', 'biography', 'awards', 'articles',
+               'albums_same_artist', 'albumsFromSameArtist', 'focus', 'performers')
+
+
+def _trim(payload):
+    trimmed = {k: v for k, v in payload.items() if k not in _HEAVY_KEYS}
+    if isinstance(trimmed.get('album'), dict):
+        trimmed['album'] = {k: v for k, v in trimmed['album'].items() if k not in _HEAVY_KEYS}
+    return trimmed
+
+
+def _merge(stored, payload):
+    """payload over the stored one: fields it lacks (or has as null) keep their stored value, nested objects too."""
+    merged = dict(stored)
+    for key, value in payload.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        elif value is not None:
+            merged[key] = value
+    return merged
+
+
+def _name(value):
+    return value.get('name') if isinstance(value, dict) else None
+
+
+def _search_text(kind, payload):
+    """Words a payload is found by: titles, artist/owner names and codes (ISRC/UPC)."""
+    album = payload.get('album') if isinstance(payload.get('album'), dict) else {}
+    if kind == 'track':
+        parts = [payload.get('title'), payload.get('version'), _name(payload.get('performer')),
+                 album.get('title'), _name(album.get('artist')), payload.get('isrc')]
+    elif kind == 'album':
+        parts = [payload.get('title'), payload.get('version'), _name(payload.get('artist')),
+                 _name(payload.get('label')), payload.get('upc')]
+    elif kind == 'playlist':
+        parts = [payload.get('name'), _name(payload.get('owner'))]
+    else:
+        parts = [payload.get('name')]
+    return ' '.join(str(p) for p in parts if p)
+
+
+class SearchIndex:
+    """Offline full-text index (SQLite FTS5) of the track/album/artist/playlist payloads the module has seen.
+
+    Payloads are stored trimmed to what a search result needs and merged with the stored one whenever
+    they are seen again, so a listing payload refreshes an entry without dropping the fields (e.g.
+    tracks_count, duration) only a full payload carries. search() only returns entries refreshed
+    within max_age seconds.
+    """
+
+    KINDS = ('track', 'album', 'artist', 'playlist')
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        try:
+            self._db.executescript('''
+                CREATE TABLE IF NOT EXISTS payloads (
+                    kind TEXT NOT NULL,
+                    id TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (kind, id)
+                );
+                CREATE VIRTUAL TABLE IF NOT EXISTS payloads_fts USING fts5(text, kind UNINDEXED, id UNINDEXED);
+            ''')
+        except sqlite3.OperationalError as e:
+            raise ValueError(f'the installed SQLite has no FTS5 support ({e})')
+
+    def add_many(self, kind: str, payloads):
+        rows = {str(p['id']): _trim(p) for p in payloads if isinstance(p, dict) and p.get('id') is not None}
+        if not rows:
+            return
+        now = time.time()
+        with self._lock, self._db:
+            ids = list(rows)
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                stored = self._db.execute(f'SELECT id, payload FROM payloads WHERE kind = ? AND id IN ({",".join("?" * len(chunk))})',
+                                          (kind, *chunk)).fetchall()
+                for item_id, payload in stored:
+                    rows[item_id] = _merge(json.loads(payload), rows[item_id])
+            rows = list(rows.items())
+            self._db.executemany('DELETE FROM payloads_fts WHERE kind = ? AND id = ?', [(kind, i) for i, _ in rows])
+            self._db.executemany('INSERT INTO payloads_fts (text, kind, id) VALUES (?, ?, ?)',
+                                 [(_search_text(kind, p), kind, i) for i, p in rows])
+            self._db.executemany('INSERT OR REPLACE INTO payloads (kind, id, payload, updated_at) VALUES (?, ?, ?, ?)',
+                                 [(kind, i, json.dumps(p, separators=(',', ':')), now) for i, p in rows])
+
+    def search(self, kind: str, query: str, limit: int = 10, max_age: float = None):
+        """Best matching payloads of kind for query (every word must match, the last one as a prefix)."""
+        words = re.findall(r'\w+', query)
+        if not words:
+            return []
+        match = ' '.join(f'"{w}"' for w in words) + '*'
+        cutoff = time.time() - max_age if max_age else 0
+        with self._lock:
+            rows = self._db.execute('''
+                SELECT p.payload FROM payloads_fts f
+                JOIN payloads p ON p.kind = f.kind AND p.id = f.id
+                WHERE payloads_fts MATCH ? AND f.kind = ? AND p.updated_at >= ?
+                ORDER BY bm25(payloads_fts) LIMIT ?
+            ''', (match, kind, cutoff, limit)).fetchall()
+        return [json.loads(row[0]) for row in rows]
@@ -0,0 +1,71 @@
+import os
+import json
+import time
+import logging
+
+
+class JsonStore:
+    """Small persisted state documents (one JSON file per key) under a module data folder.
+
+    Writes go to a temporary file that is then renamed over the old one, so a crash never
+    leaves a truncated document behind.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, key):
+        safe_key = ''.join(c if c.isalnum() or c in '-_.' else '_' for c in str(key))
+        return os.path.join(self.root, safe_key + '.json')
+
+    def load(self, key, default=None):
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return default
+        except (OSError, ValueError) as e:
+            logging.debug(f"Qobuz: ignoring unreadable state {key}: {e}")
+            return default
+
+    def save(self, key, value):
+        path = self._path(key)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(value, f)
+        os.replace(tmp_path, path)
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def touch(self, key):
+        """Mark a document as just used, for prune()."""
+        try:
+            os.utime(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def prune(self, max_entries: int, max_age: float = None):
+        """LRU bound: delete documents older than max_age seconds, then the least recently saved/touched ones
+        beyond max_entries. Returns the number of documents deleted."""
+        entries = []
+        with os.scandir(self.root) as it:
+            for entry in it:
+                if entry.name.endswith('.json'):
+                    try:
+                        entries.append((entry.stat().st_mtime, entry.path))
+                    except FileNotFoundError:
+                        pass
+        entries.sort(reverse=True)
+        cutoff = time.time() - max_age if max_age else None
+        victims = [path for i, (mtime, path) in enumerate(entries) if i >= max_entries or (cutoff and mtime < cutoff)]
+        for path in victims:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        return len(victims)